@@ -1,3 +1,20 @@
+import os
 import pathlib
+import sys
 SRC = pathlib.Path(__file__).parent
 SCHEMA = SRC / "save_schema-2022-10-16.xsd"
+
+
+def get_cache_dir() -> pathlib.Path:
+    """Where to keep cached data, CC2ME_CACHE_DIR overrides the per-user default"""
+    override = os.environ.get("CC2ME_CACHE_DIR")
+    if override:
+        return pathlib.Path(override)
+    home = pathlib.Path.home()
+    if sys.platform == "win32":
+        base = pathlib.Path(os.environ.get("LOCALAPPDATA", home / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = home / "Library" / "Caches"
+    else:
+        base = pathlib.Path(os.environ.get("XDG_CACHE_HOME", home / ".cache"))
+    return base / "cc2me"
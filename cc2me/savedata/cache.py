@@ -0,0 +1,126 @@
+"""
+On disk cache of parsed saves so that reopening an unchanged file skips parsing.
+
+The cache is opt-in, load_save_file(filename, cache=True) uses the per-user default_snapshot_cache()
+(CC2ME_CACHE_DIR overrides where it is kept) and a SnapshotCache can be passed to use another one.
+"""
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Optional, Dict, Tuple
+from xml.etree.ElementTree import Element
+
+from ..paths import get_cache_dir
+from .logging import logger
+
+# bump when the cached form changes
+CACHE_FORMAT = 1
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".snapshot"
+
+Snapshot = Tuple[Dict[str, Element], Dict[str, bytes]]
+
+
+def file_digest(filename: str) -> str:
+    with open(filename, "rb") as fd:
+        return hashlib.blake2b(fd.read(), digest_size=20).hexdigest()
+
+
+class SnapshotCache:
+    """
+    Parsed save roots (and raw spans) stored as pickles, one per file and loader variant.
+
+    Each entry starts with a small header holding the size, mtime and content hash of the file it was made
+    from, so a stale entry is found without loading the body. Entries are evicted least recently used first
+    once the cache grows past max_size bytes.
+    """
+    def __init__(self, directory: Path, max_size: int = DEFAULT_CACHE_SIZE):
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+    def entry_path(self, filename: str, variant: str) -> Path:
+        name = hashlib.sha1(f"{os.path.abspath(filename)}|{variant}".encode()).hexdigest()
+        return self.directory / f"{name}{ENTRY_SUFFIX}"
+
+    @staticmethod
+    def file_key(filename: str) -> dict:
+        """The path, size, mtime and content hash of a file"""
+        stat = os.stat(filename)
+        return {
+            "format": CACHE_FORMAT,
+            "path": os.path.abspath(filename),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "digest": file_digest(filename),
+        }
+
+    def get(self, filename: str, variant: str, key: dict) -> Optional[Snapshot]:
+        """Get the snapshot of a file, key is from file_key() and must match the one it was stored with"""
+        entry = self.entry_path(filename, variant)
+        try:
+            with open(entry, "rb") as fd:
+                if pickle.load(fd) != key:
+                    return None
+                roots, raw_spans = pickle.load(fd)
+            # mark as recently used
+            os.utime(entry)
+            return roots, raw_spans
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.PickleError, EOFError, ValueError, TypeError) as err:
+            logger.warning(f"ignoring snapshot cache entry {entry}: {err}")
+            return None
+
+    def put(self, filename: str, variant: str, key: dict, roots: Dict[str, Element], raw_spans: Dict[str, bytes]):
+        """Store a snapshot, key should be taken before the file was parsed"""
+        entry = self.entry_path(filename, variant)
+        temp = entry.with_suffix(".tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temp, "wb") as fd:
+                pickle.dump(key, fd, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump((roots, raw_spans), fd, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, entry)
+            self.evict()
+        except OSError as err:
+            logger.warning(f"could not write snapshot cache entry {entry}: {err}")
+
+    def entries(self):
+        if not self.directory.is_dir():
+            return []
+        return list(self.directory.glob(f"*{ENTRY_SUFFIX}"))
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_size"""
+        entries = []
+        for entry in self.entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        entries.sort()
+        total = sum(x[1] for x in entries)
+        for _, size, entry in entries:
+            if total <= self.max_size:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for entry in self.entries():
+            entry.unlink()
+
+
+_default_cache: Optional[SnapshotCache] = None
+
+
+def default_snapshot_cache() -> SnapshotCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SnapshotCache(get_cache_dir() / "snapshots")
+    return _default_cache
@@ -1,7 +1,7 @@
 import random
 from abc import ABC
 from enum import Enum
-from typing import cast, List, Optional, Union
+from typing import cast, Dict, List, NamedTuple, Optional, Tuple, Union
 
 MAX_INTEGER = 4294967295
 
@@ -27,17 +27,17 @@ def generate_island_seed() -> int:
 class XEnum(Enum):
     @classmethod
     def lookup(cls, value):
-        for item in cls:
-            if item.value == value:
-                return item
-        raise KeyError(value)
+        try:
+            return cls._value2member_map_[value]
+        except (KeyError, TypeError):
+            raise KeyError(value)
 
     @classmethod
     def reverse_lookup(cls, name):
-        for item in cls:
-            if item.name == name:
-                return item
-        return KeyError(name)
+        try:
+            return cls._member_map_[name]
+        except (KeyError, TypeError):
+            raise KeyError(name)
 
 
 class IntEnum(XEnum):
@@ -50,9 +50,9 @@ class IntEnum(XEnum):
 
     @classmethod
     def get_name(cls, num: int):
-        for item in cls:
-            if item.value == num:
-                return str(item.name)
+        item = cls._value2member_map_.get(num)
+        if item is not None:
+            return str(item.name)
         return f"Unknown {num}"
 
 
@@ -466,26 +466,14 @@ ATTACHMENT_CAPACITY.append(
                        VehicleType.Swordfish))
 
 
-def get_attachment_capacity(
-        vehicle: Union[VehicleType, int],
-        attachment: Union[VehicleAttachmentDefinitionIndex, int]) -> Optional[Capacity]:
-    if isinstance(vehicle, int):
-        vehicle = VehicleType.lookup(vehicle)
-    if isinstance(attachment, int):
-        attachment = VehicleAttachmentDefinitionIndex.lookup(attachment)
-
-    for item in ATTACHMENT_CAPACITY:
-        if item.attachment == attachment:
-            if vehicle in item.vtypes:
-                return item
-
+def _default_capacity(vehicle: VehicleType, attachment: VehicleAttachmentDefinitionIndex) -> Optional[Capacity]:
     cap = None
-    if attachment in TURRET_ATTACHMENTS + [VehicleAttachmentDefinitionIndex.Gun20mm]:
+    if attachment in TURRET_ATTACHMENTS or attachment == VehicleAttachmentDefinitionIndex.Gun20mm:
         # default 100 rounds
         cap = AmmunitionCapacity(attachment, 100, vehicle)
     elif attachment in HARDPOINT_ATTACHMENTS:
         cap = AmmunitionCapacity(attachment, 1, vehicle)
-    if attachment in [VehicleAttachmentDefinitionIndex.FuelTank]:
+    if attachment == VehicleAttachmentDefinitionIndex.FuelTank:
         cap = FuelTankCapacity(attachment, 100, vehicle)
 
     if attachment == VehicleAttachmentDefinitionIndex.Autocannon:
@@ -494,17 +482,73 @@ def get_attachment_capacity(
     return cap
 
 
+class RuleDuplicate(NamedTuple):
+    """A (vehicle, attachment) pair listed by more than one rule, the first rule wins"""
+    vehicle: VehicleType
+    attachment: VehicleAttachmentDefinitionIndex
+    kept: Capacity
+    ignored: Capacity
+
+    @property
+    def conflicting(self) -> bool:
+        """True if the ignored rule would have given a different capacity"""
+        return type(self.kept) is not type(self.ignored) or self.kept.count != self.ignored.count
+
+
+CapacityKey = Tuple[VehicleType, VehicleAttachmentDefinitionIndex]
+
+
+def compile_capacity_rules(rules: List[Capacity]) -> Tuple[Dict[CapacityKey, Capacity], List[RuleDuplicate]]:
+    """
+    Index capacity rules by (vehicle, attachment), the first rule listing a pair wins
+    :param rules:
+    :return: the index and the later rules that listed a pair again
+    """
+    table: Dict[CapacityKey, Capacity] = {}
+    duplicates = []
+    for item in rules:
+        for vehicle in item.vtypes:
+            key = (vehicle, item.attachment)
+            kept = table.setdefault(key, item)
+            if kept is not item:
+                duplicates.append(RuleDuplicate(vehicle, item.attachment, kept, item))
+    return table, duplicates
+
+
+CAPACITY_TABLE, CAPACITY_DUPLICATES = compile_capacity_rules(ATTACHMENT_CAPACITY)
+# pairs not listed in ATTACHMENT_CAPACITY, None where there is no capacity at all
+DEFAULT_CAPACITY_TABLE: Dict[CapacityKey, Optional[Capacity]] = {
+    (vehicle, attachment): _default_capacity(vehicle, attachment)
+    for vehicle in VehicleType for attachment in VehicleAttachmentDefinitionIndex
+}
+
+DEFAULT_STATE_TABLE: Dict[VehicleType, List[Capacity]] = {
+    v_type: [item for item in VEHICLE_DEFAULT_STATE if v_type in item.vtypes] for v_type in VehicleType
+}
+DEFAULT_HITPOINTS_TABLE: Dict[VehicleType, Optional[float]] = {
+    v_type: next((item.count for item in states if isinstance(item, Hitpoints)), None)
+    for v_type, states in DEFAULT_STATE_TABLE.items()
+}
+
+
+def get_attachment_capacity(
+        vehicle: Union[VehicleType, int],
+        attachment: Union[VehicleAttachmentDefinitionIndex, int]) -> Optional[Capacity]:
+    if isinstance(vehicle, int):
+        vehicle = VehicleType.lookup(vehicle)
+    if isinstance(attachment, int):
+        attachment = VehicleAttachmentDefinitionIndex.lookup(attachment)
+
+    key = (vehicle, attachment)
+    cap = CAPACITY_TABLE.get(key)
+    if cap is None:
+        cap = DEFAULT_CAPACITY_TABLE.get(key)
+    return cap
+
+
 def get_default_hitpoints(v_type: VehicleType) -> Optional[float]:
-    states = get_default_state(v_type)
-    for item in states:
-        if isinstance(item, Hitpoints):
-            return item.count
-    return None
+    return DEFAULT_HITPOINTS_TABLE.get(v_type)
 
 
 def get_default_state(v_type: VehicleType) -> List[Capacity]:
-    values = []
-    for item in VEHICLE_DEFAULT_STATE:
-        if v_type in item.vtypes:
-            values.append(item)
-    return values
+    return list(DEFAULT_STATE_TABLE.get(v_type, []))
@@ -0,0 +1,84 @@
+"""Serialise save roots as a stream of text chunks"""
+import io
+from typing import Iterator, Iterable, IO, Optional
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element
+from xml.sax.saxutils import escape
+
+from .instrumentation import Report, PHASE_WRITE
+
+# elements above this depth are streamed piece by piece, deeper ones are serialised whole
+STREAM_DEPTH = 3
+
+CHUNK_SIZE = 65536
+
+
+def start_tag(element: Element) -> str:
+    shallow = Element(element.tag, element.attrib)
+    text = ElementTree.tostring(shallow, encoding="unicode", short_empty_elements=False)
+    return text[:-len(f"</{element.tag}>")]
+
+
+def serialize(element: Element) -> str:
+    """Serialise an element without its tail"""
+    tail = element.tail
+    element.tail = None
+    try:
+        return ElementTree.tostring(element, encoding="unicode")
+    finally:
+        element.tail = tail
+
+
+def iter_element(element: Element, depth: int = 1) -> Iterator[str]:
+    """Serialise an element (without its tail) in pieces"""
+    if depth >= STREAM_DEPTH or not len(element):
+        yield serialize(element)
+    else:
+        yield start_tag(element)
+        yield escape(element.text or "")
+        for child in element:
+            yield from iter_element(child, depth + 1)
+            yield escape(child.tail or "")
+        yield f"</{element.tag}>"
+
+
+def chunked(pieces: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Join small pieces of text into chunks of at least size characters"""
+    pending = []
+    pending_size = 0
+    for piece in pieces:
+        pending.append(piece)
+        pending_size += len(piece)
+        if pending_size >= size:
+            yield "".join(pending)
+            pending.clear()
+            pending_size = 0
+    if pending:
+        yield "".join(pending)
+
+
+def write_chunks(chunks: Iterable[str], fileobj: IO, encoding: str = "utf-8", report: Optional[Report] = None) -> int:
+    """
+    Write text chunks to a text or binary file object, return the number of characters written
+    :param chunks:
+    :param fileobj:
+    :param encoding: used for binary file objects
+    :param report: add the time spent writing and the amount written to this report
+    :return:
+    """
+    binary = not isinstance(fileobj, io.TextIOBase)
+    if report is None:
+        report = Report()
+    written = 0
+    for chunk in chunks:
+        with report.phase(PHASE_WRITE):
+            if binary:
+                data = chunk.encode(encoding)
+                fileobj.write(data)
+                report.count("bytes", len(data))
+            else:
+                fileobj.write(chunk)
+        written += len(chunk)
+        report.count("chunks")
+    report.count("chars", written)
+    return written
@@ -0,0 +1,134 @@
+"""Dictionary indexes over the children of a save container element"""
+from typing import Callable, Dict, List, Optional, Iterable, Any
+from xml.etree.ElementTree import Element
+
+
+class ElementIndex:
+    """
+    Index the children of a container element by their id attribute, and optionally by some other attributes.
+
+    The index is built on first use and rebuilt when the container looks different from when it was
+    built (another element or a different number of children). A lookup by id also checks that the element
+    found still has that id, and re-reads the ids if it does not. A missing id is not searched for, so after
+    giving an element a new id directly on the tree call invalidate(). Secondary indexes are built on first
+    use and dropped by invalidate_secondary() or a rebuild.
+    """
+    def __init__(self, get_container: Callable[[], Element], tag: str,
+                 key: str = "id", secondary: Iterable[str] = ()):
+        self.get_container = get_container
+        self.tag = tag
+        self.key = key
+        self.secondary_attribs = list(secondary)
+        self._container: Optional[Element] = None
+        self._size = -1
+        self.by_key: Dict[str, Element] = {}
+        self.secondary: Dict[str, Dict[str, List[Element]]] = {}
+
+    def _check(self) -> Element:
+        container = self.get_container()
+        if container is not self._container or len(container) != self._size:
+            self.rebuild(container)
+        return container
+
+    def rebuild(self, container: Optional[Element] = None):
+        if container is None:
+            container = self.get_container()
+        self._container = container
+        self._size = len(container)
+        self._read_keys(container)
+        self.secondary.clear()
+
+    def _read_keys(self, container: Element):
+        self.by_key = {x.attrib.get(self.key): x for x in container if x.tag == self.tag}
+
+    def invalidate(self):
+        """Rebuild on next use"""
+        self._container = None
+
+    def invalidate_secondary(self):
+        self.secondary.clear()
+
+    def get(self, key: Any) -> Optional[Element]:
+        key = str(key)
+        container = self._check()
+        element = self.by_key.get(key)
+        if element is not None and element.attrib.get(self.key) != key:
+            # an id was changed behind our back, the elements (and so the secondary indexes) are the same
+            self._read_keys(container)
+            element = self.by_key.get(key)
+        return element
+
+    def find(self, attrib: str, value: Any) -> List[Element]:
+        """All the elements with an attribute value, attrib must be one of the secondary attributes"""
+        self._check()
+        if attrib not in self.secondary:
+            found = {}
+            for element in self.by_key.values():
+                found.setdefault(element.attrib.get(attrib), []).append(element)
+            self.secondary[attrib] = found
+        return list(self.secondary[attrib].get(str(value), []))
+
+    def add(self, element: Element):
+        """Record an element just appended to the container"""
+        container = self.get_container()
+        if container is not self._container or len(container) != self._size + 1:
+            self.invalidate()
+            return
+        self._size += 1
+        self.by_key[element.attrib.get(self.key)] = element
+        for attrib, found in self.secondary.items():
+            found.setdefault(element.attrib.get(attrib), []).append(element)
+
+    def remove(self, element: Element):
+        """Forget an element just removed from the container"""
+        self.remove_all([element])
+
+    def remove_all(self, elements: List[Element]):
+        """Forget some elements just removed from the container"""
+        container = self.get_container()
+        if container is not self._container or len(container) != self._size - len(elements):
+            self.invalidate()
+            return
+        self._size -= len(elements)
+        for element in elements:
+            key = element.attrib.get(self.key)
+            if self.by_key.get(key) is element:
+                del self.by_key[key]
+        doomed = set(elements)
+        for attrib, found in self.secondary.items():
+            for value in {x.attrib.get(attrib) for x in elements}:
+                if value in found:
+                    found[value] = [x for x in found[value] if x not in doomed]
+
+
+class IdAllocator:
+    """
+    Hand out new ids above the highest one in use.
+
+    The highest id is found by scan() on first use, after that each new id costs O(1). Call invalidate()
+    if ids were added without going through allocate() or note().
+    """
+    def __init__(self, scan: Callable[[], int]):
+        self.scan = scan
+        self._last: Optional[int] = None
+
+    def invalidate(self):
+        self._last = None
+
+    @property
+    def last(self) -> int:
+        """The highest id in use"""
+        if self._last is None:
+            self._last = self.scan()
+        return self._last
+
+    def allocate(self, count: int = 1, floor: int = 0) -> range:
+        """Reserve count ids after the highest in use (and after floor)"""
+        start = max(self.last, floor) + 1
+        self._last = start + count - 1
+        return range(start, start + count)
+
+    def note(self, value: int):
+        """Record an id given out some other way"""
+        if self._last is not None and value > self._last:
+            self._last = value
@@ -0,0 +1,75 @@
+"""Phase timings, counters and progress callbacks for loading and exporting saves"""
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Iterable, Iterator, TypeVar
+
+# called with (phase, done, total), total is 0 if it is not known
+ProgressCallback = Callable[[str, int, int], None]
+
+PHASE_READ = "read"
+PHASE_PARSE = "parse"
+PHASE_CACHE = "cache"
+PHASE_BUILD = "build"
+PHASE_EXPORT = "export"
+PHASE_WRITE = "write"
+
+T = TypeVar("T")
+
+
+def root_phase(root: str) -> str:
+    """Name of the phase parsing one root, for engines that parse them one at a time"""
+    return f"{PHASE_PARSE}:{root}"
+
+
+class Report:
+    """
+    What happened during a load or an export.
+    phases holds the seconds spent in each phase, counters things like bytes and elements.
+    """
+    def __init__(self, progress: Optional[ProgressCallback] = None):
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.progress_callback = progress
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def __str__(self):
+        lines = [f"total {self.seconds:.3f} s"]
+        lines.extend(f"{name:<16} {seconds:.3f} s" for name, seconds in self.phases.items())
+        lines.extend(f"{name:<16} {value}" for name, value in self.counters.items())
+        return "\n".join(lines)
+
+    def add_time(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def timed(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """Iterate items, adding the time taken to produce each one to a phase"""
+        items = iter(items)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                self.add_time(name, time.perf_counter() - started)
+                return
+            self.add_time(name, time.perf_counter() - started)
+            yield item
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def progress(self, phase: str, done: int, total: int = 0):
+        if self.progress_callback is not None:
+            self.progress_callback(phase, done, total)
+
+    def finish(self) -> "Report":
+        self.seconds = time.perf_counter() - self.started
+        return self
@@ -1,17 +1,33 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Union, Tuple, Iterator, Iterable, IO, Any, Type, TypeVar, Set
 from xml.etree.ElementTree import Element
+import mmap
 import os
 import re
 from xml.etree import ElementTree
 from io import StringIO
+from xml.sax.saxutils import escape
 
 from .types.abstract import CC2Save
+from .types.spawndata import VehicleSpawn
 from .types.teams import Team
 from .types.tiles import Tile
+from .types.utils import ElementProxy, ProxyCache
+from .types.weather import Weather
 from .types.vehicles.vehicle import Vehicle
-from .types.vehicles.vehicle_state import VehicleStateContainer
+from .types.vehicles.vehicle_state import VehicleStateContainer, EmbeddedStateCache
 from ..paths import SCHEMA
 from .logging import logger
+from .cache import SnapshotCache, default_snapshot_cache
+from .indexes import ElementIndex, IdAllocator
+from .export import chunked, iter_element, write_chunks
+from .instrumentation import Report, ProgressCallback, PHASE_READ, PHASE_PARSE, PHASE_CACHE, PHASE_BUILD, \
+    PHASE_EXPORT, root_phase
+from .parallel import parse_roots
+from .rawspans import RawSpans, find_weather_spans
+from .splice import CC2SpliceParser, SpliceSource
+from .spatial import SpatialGrid, Box, vehicle_box, tile_box, spawn_box
+from .validation import Validator, Diagnostic
+from .vehicletable import VehicleTable
 from .constants import POS_Y_SEABOTTOM, BIOME_SANDY_PINES, VehicleType, get_default_state
 
 XML_START = '<?xml version="1.0" encoding="UTF-8"?>'
@@ -21,8 +37,23 @@ VEHICLES_ROOT = "vehicles"
 MISSILES_ROOT = "missiles"
 ROOT_ORDER = [META_ROOT, SCENE_ROOT, VEHICLES_ROOT, MISSILES_ROOT]
 
+# loader engines, see load_save_file()
+ENGINE_SEEK = "seek"
+ENGINE_SINGLE_PASS = "single-pass"
+ENGINE_MMAP = "mmap"
+ENGINE_SPLICE = "splice"
+ENGINE_PARALLEL = "parallel"
+LOADER_ENGINES = [ENGINE_SEEK, ENGINE_SINGLE_PASS, ENGINE_MMAP, ENGINE_SPLICE, ENGINE_PARALLEL]
+
+FEED_SIZE = 65536
+
+# synthetic document element used to hold all the roots of a save at once
+WRAPPER_ROOT = "cc2me-save"
+
 CARRIER_VEH_DEF_INDEX = "0"
 
+P = TypeVar("P", bound=ElementProxy)
+
 
 class JunkRoot(Exception):
     def __init__(self, position: int, previous=None):
@@ -32,10 +63,11 @@ class JunkRoot(Exception):
 
 class StoppableStringIO(StringIO):
     """control read() calls and only read 1 byte at a time"""
-    def __init__(self):
+    def __init__(self, report: Optional[Report] = None):
         super(StoppableStringIO, self).__init__()
         self.stop_reads = False
-        self.size = len(self.getvalue())
+        self.size = 0
+        self.report = report
 
     def __repr__(self):
         return self.getvalue()[self.tell():-64]
@@ -43,10 +75,8 @@ class StoppableStringIO(StringIO):
     def read(self, size: Optional[int] = ...) -> str:
         if self.stop_reads:
             return ""
-        # log reading
-        pos = self.tell()
-        if pos % 512 == 0:
-            logger.info(f"reading {pos}/{self.size} ..")
+        if self.report is not None:
+            self.report.progress(PHASE_PARSE, self.tell(), self.size)
 
         return super(StoppableStringIO, self).read(size)
 
@@ -105,9 +135,179 @@ class CC2ElementTree(ElementTree.ElementTree):
         return self.getroot()
 
 
+def find_content_start(data: bytes) -> int:
+    """Return the offset of the first root in the start of a save, after any xml declaration"""
+    start = len(data) - len(data.lstrip())
+    if data.startswith(b"<?", start):
+        end = data.find(b"?>", start)
+        if end != -1:
+            return end + 2
+    return start
+
+
+class CC2SinglePassParser:
+    """
+    Parse every root of a save in one forward pass.
+
+    A save file is several XML documents one after another, so the roots are fed inside a synthetic
+    wrapper element (with the XML declaration removed) and the wrapper children are returned on close().
+    """
+    def __init__(self):
+        self.parser = ElementTree.XMLParser(target=ElementTree.TreeBuilder())
+        self.parser.feed(f"<{WRAPPER_ROOT}>")
+        self.prolog = ""
+        self.prolog_done = False
+
+    def _strip_prolog(self, data: str) -> str:
+        # hold back data until we have seen the end of the xml declaration (if there is one)
+        self.prolog += data
+        content = self.prolog.lstrip()
+        if not content:
+            return ""
+        if not content.startswith("<?"):
+            self.prolog_done = True
+        elif "?>" in content:
+            self.prolog_done = True
+            content = content.split("?>", 1)[1]
+        elif len(content) < 2 and "<?".startswith(content):
+            return ""
+        if self.prolog_done:
+            self.prolog = ""
+            return content
+        return ""
+
+    def skip_prolog(self, data: bytes) -> int:
+        """Return the offset of the first root in data, marking the declaration as already handled"""
+        self.prolog_done = True
+        return find_content_start(data)
+
+    def feed(self, data: Union[str, bytes, memoryview]) -> None:
+        if not self.prolog_done:
+            data = self._strip_prolog(data)
+        if data:
+            self.parser.feed(data)
+
+    def close(self) -> Dict[str, Element]:
+        if self.prolog:
+            # never saw a complete declaration, let the parser report on what we held back
+            self.parser.feed(self.prolog)
+        self.parser.feed(f"</{WRAPPER_ROOT}>")
+        wrapper = self.parser.close()
+        return {x.tag: x for x in wrapper}
+
+
 class CC2XMLSave(CC2Save):
     def __init__(self):
         self.roots = {}
+        self.raw_spans = RawSpans()
+        self._weather: Optional[Weather] = None
+        # set by the splice loader, see export()
+        self.splice: Optional[SpliceSource] = None
+        self.load_report: Optional[Report] = None
+        self.export_report: Optional[Report] = None
+        # the same element always gets the same proxy object
+        self.proxies = ProxyCache()
+        # parsed vehicle and attachment states, written back by iter_export()
+        self.embedded_states = EmbeddedStateCache()
+        self._vehicle_index = ElementIndex(lambda: self.vehicles_parent, Vehicle.tag,
+                                           secondary=["definition_index", "team_id"])
+        self._vehicle_state_index = ElementIndex(lambda: self.vehicle_states_parent, VehicleStateContainer.tag)
+        self._tile_index = ElementIndex(lambda: self.tiles_container, Tile.tag)
+        self._team_index = ElementIndex(lambda: self.teams_container, "t")
+        self._vehicle_ids = IdAllocator(lambda: max([int(x.attrib.get("id", 0)) for x in self._vehicles], default=0))
+        self._respawn_ids = IdAllocator(self._scan_respawn_ids)
+        # built on first query, kept up to date by moved()
+        self._spatial: Optional[SpatialGrid] = None
+        # built on first use, told about changes by touched()
+        self._validator: Optional[Validator] = None
+
+    def reindex(self, item: Optional[Any] = None):
+        """Tell the indexes that an indexed attribute of item (or anything if not given) has changed"""
+        if item is None or isinstance(item, Vehicle):
+            self._vehicle_index.invalidate_secondary()
+        if item is not None:
+            self.touched([item])
+        elif self._validator is not None:
+            self._validator.reset()
+        if item is None:
+            for index in [self._vehicle_index, self._vehicle_state_index, self._tile_index, self._team_index]:
+                index.invalidate()
+            self._vehicle_ids.invalidate()
+            self._respawn_ids.invalidate()
+            self._spatial = None
+
+    def _wrap(self, proxy: Type[P], element: Element) -> P:
+        return self.proxies.get(proxy, element, self)
+
+    @property
+    def _spawns(self) -> Iterator[Element]:
+        return self.roots[SCENE_ROOT].getroot().iterfind("./tiles/tiles/t/spawn_data/vehicles/v")
+
+    @property
+    def spatial(self) -> SpatialGrid:
+        """Where the vehicles, tiles and tile spawns are, keyed by element"""
+        if self._spatial is None:
+            grid = SpatialGrid()
+            for element in self._vehicles:
+                grid.insert(element, vehicle_box(element), Vehicle)
+            for element in self._tiles:
+                grid.insert(element, tile_box(element), Tile)
+            for element in self._spawns:
+                grid.insert(element, spawn_box(element), VehicleSpawn)
+            self._spatial = grid
+        return self._spatial
+
+    def moved(self, items: Iterable[ElementProxy]):
+        """Tell the spatial index that some vehicles, tiles or spawns have moved (or been added)"""
+        if self._spatial is None:
+            return
+        for item in items:
+            if isinstance(item, Vehicle):
+                self._spatial.insert(item.element, vehicle_box(item.element), Vehicle)
+            elif isinstance(item, Tile):
+                self._spatial.insert(item.element, tile_box(item.element), Tile)
+            elif isinstance(item, VehicleSpawn):
+                self._spatial.insert(item.element, spawn_box(item.element), VehicleSpawn)
+
+    @property
+    def validator(self) -> Validator:
+        """Checks the save against the rules, see Validator"""
+        if self._validator is None:
+            self._validator = Validator(self)
+        return self._validator
+
+    def validate(self, incremental: bool = True) -> List[Diagnostic]:
+        """Check the save, only the vehicles touched since the last check if incremental"""
+        return self.validator.run(incremental)
+
+    def touched(self, items: Iterable[ElementProxy]):
+        """Tell the validator that some vehicles or vehicle states have changed (or been added or removed)"""
+        if self._validator is not None:
+            self._validator.touch(items)
+
+    def _forget_positions(self, elements: Iterable[Element]):
+        if self._spatial is not None:
+            for element in elements:
+                self._spatial.remove(element)
+
+    def query_box(self, box: Box, kinds: Optional[Tuple[Type[ElementProxy], ...]] = None) -> List[ElementProxy]:
+        """
+        Find what is in an area
+        :param box: min x, min z, max x, max z
+        :param kinds: any of Vehicle, Tile and VehicleSpawn, all of them if not given
+        :return: the vehicles, tiles and spawns that overlap the box
+        """
+        return [self._wrap(self.spatial.kinds[x], x) for x in self.spatial.query_box(box, kinds)]
+
+    def query_radius(self, x: float, z: float, radius: float,
+                     kinds: Optional[Tuple[Type[ElementProxy], ...]] = None) -> List[ElementProxy]:
+        """Find what is within radius of a point, for tiles any part of the tile bounds counts"""
+        return [self._wrap(self.spatial.kinds[key], key) for key in self.spatial.query_radius(x, z, radius, kinds)]
+
+    def nearest(self, x: float, z: float, count: int = 1,
+                kinds: Optional[Tuple[Type[ElementProxy], ...]] = None) -> List[ElementProxy]:
+        """Find the count things closest to a point, nearest first"""
+        return [self._wrap(self.spatial.kinds[key], key) for key in self.spatial.nearest(x, z, count, kinds)]
 
     @property
     def _tiles(self) -> List[Element]:
@@ -115,26 +315,26 @@ class CC2XMLSave(CC2Save):
 
     @property
     def tiles(self) -> List[Tile]:
-        return [Tile(element=x, cc2obj=self) for x in self._tiles]
+        return [self._wrap(Tile, x) for x in self._tiles]
 
     def tile(self, tile_id: int) -> Tile:
         """Get a tile by ID"""
-        for item in self.tiles:
-            if item.id == tile_id:
-                return item
+        element = self._tile_index.get(tile_id)
+        if element is None:
+            raise KeyError(tile_id)
+        return self._wrap(Tile, element)
 
-        raise KeyError(tile_id)
+    def find_vehicles_by_definition(self, definition_id: int) -> List[Vehicle]:
+        return [self._wrap(Vehicle, x) for x in self._vehicle_index.find("definition_index", definition_id)]
 
-    def find_vehicles_by_definition(self, definition_id: int):
-        return [
-            x for x in self.vehicles if x.definition_index == definition_id
-        ]
+    def find_vehicles_by_team(self, team_id: int) -> List[Vehicle]:
+        return [self._wrap(Vehicle, x) for x in self._vehicle_index.find("team_id", team_id)]
 
     def vehicle(self, vid: int):
-        for x in self.vehicles:
-            if x.id == vid:
-                return x
-        raise KeyError(vid)
+        element = self._vehicle_index.get(vid)
+        if element is None:
+            raise KeyError(vid)
+        return self._wrap(Vehicle, element)
 
     @property
     def tiles_parent(self) -> Element:
@@ -157,54 +357,118 @@ class CC2XMLSave(CC2Save):
         tile.index = tile.id - 1
         self.last_tile_id = tile.id
         self.tiles_container.append(tile.element)
+        self._tile_index.add(tile.element)
+        self.proxies.add(tile)
         tile.set_position(x=0, z=0, y=POS_Y_SEABOTTOM)
         return tile
 
     def remove_tile(self, tile: Tile):
         """Delete a tile"""
-        # find the tile element, remove it, then re-compute the id and index values
-        tid = str(tile.id)
+        self.remove_tiles([tile])
+
+    def remove_tiles(self, tiles: Iterable[Tile]) -> int:
+        """
+        Delete some tiles (and the spawns on them), then renumber the ids and indexes of the rest
+        :return: the number of tiles removed
+        """
+        doomed = {x.element for x in tiles}
+        container = self.tiles_container
+        removed = [x for x in container if x in doomed]
+        if not removed:
+            return 0
+        container[:] = [x for x in container if x not in doomed]
+        for element in removed:
+            self.proxies.drop(element)
+            self._forget_positions(element.iterfind("./spawn_data/vehicles/v"))
+        self._forget_positions(removed)
         index_value = 0
-        for tile in self.tiles:
-            tile.id = index_value + 1
-            tile.index = index_value
-            index_value += 1
-        tids = [x for x in self.tiles_container if x.attrib.get("id") == tid]
-        if tids:
-            self.tiles_container.remove(tids[0])
+        for element in container:
+            if element.tag == "t":
+                element.attrib["id"] = str(index_value + 1)
+                element.attrib["index"] = str(index_value)
+                index_value += 1
+        # the ids have changed
+        self._tile_index.invalidate()
         self.tiles_parent.attrib.update(id_counter=str(index_value))
+        return len(removed)
 
     def remove_vehicle(self, vehicle: Vehicle):
         """Delete a vehicle and its state data"""
-        # this might go wrong if other units refer to this vehicle somehow..
-        vparent = self.vehicles_parent
-        vsparent = self.vehicle_states_parent
-
         if vehicle:
-            vid = str(vehicle.id)
-            state = vehicle.state
-            if state:
-                vse = [x for x in vsparent if x.attrib.get("id") == vid]
-                if vse:
-                    vsparent.remove(vse[0])
-            ve = [x for x in vparent if x.attrib.get("id") == vid]
-            if ve:
-                vparent.remove(ve[0])
+            self.remove_vehicles([vehicle])
+
+    def remove_vehicles(self, vehicles: Iterable[Vehicle]) -> int:
+        """
+        Delete some vehicles, their state data and any tile spawns with their ids
+        :return: the number of vehicles removed
+        """
+        # this might go wrong if other units refer to these vehicles somehow..
+        vehicles = [x for x in vehicles if x]
+        ids = {str(x.id) for x in vehicles}
+        if not ids:
+            return 0
+        removed = self._remove_children(self.vehicles_parent, self._vehicle_index, ids)
+        self._remove_children(self.vehicle_states_parent, self._vehicle_state_index, ids)
+        self.remove_spawns(int(x) for x in ids)
+        self.touched(vehicles)
+        return removed
+
+    def _remove_children(self, parent: Element, index: ElementIndex, ids: Set[str]) -> int:
+        removed = [x for x in parent if x.tag == index.tag and x.attrib.get(index.key) in ids]
+        if removed:
+            doomed = set(removed)
+            parent[:] = [x for x in parent if x not in doomed]
+            index.remove_all(removed)
+            for element in removed:
+                self.proxies.drop(element)
+            self._forget_positions(removed)
+        return len(removed)
+
+    def remove_spawns(self, respawn_ids: Iterable[int]) -> int:
+        """
+        Delete the tile spawns with some respawn ids
+        :return: the number of spawns removed
+        """
+        ids = {str(x) for x in respawn_ids}
+        removed = 0
+        for container in self.roots[SCENE_ROOT].getroot().iterfind("./tiles/tiles/t/spawn_data/vehicles"):
+            doomed = {x for x in container if x.find("data") is not None and
+                      x.find("data").attrib.get("respawn_id") in ids}
+            if doomed:
+                container[:] = [x for x in container if x not in doomed]
+                for element in doomed:
+                    self.proxies.drop(element)
+                self._forget_positions(doomed)
+                removed += len(doomed)
+        return removed
+
+    @property
+    def weather(self) -> Weather:
+        if self._weather is None:
+            element = self.roots[SCENE_ROOT].getroot().find("./weather")
+            self._weather = Weather(element=element, cc2obj=self)
+            if element is None:
+                self.roots[SCENE_ROOT].getroot().append(self._weather.element)
+        return self._weather
 
     @property
     def _teams(self) -> List[Element]:
         return self.roots[SCENE_ROOT].getroot().findall("./teams/teams/t")
 
+    @property
+    def teams_container(self) -> Element:
+        return self.roots[SCENE_ROOT].getroot().find("./teams/teams")
+
     @property
     def teams(self) -> List[Team]:
-        return [Team(x) for x in self._teams]
+        return [self._wrap(Team, x) for x in self._teams]
 
     def team(self, teamid: int) -> Team:
         """Get a team by ID"""
-        for x in self.teams:
-            if x.id == teamid:
-                return x
-        raise KeyError(teamid)
+        element = self._team_index.get(teamid)
+        if element is None:
+            raise KeyError(teamid)
+        return self._wrap(Team, element)
 
     @property
     def _vehicles(self) -> List[Element]:
@@ -216,13 +480,13 @@ class CC2XMLSave(CC2Save):
 
     @property
     def vehicles(self) -> List[Vehicle]:
-        return [Vehicle(element=x, cc2obj=self) for x in self._vehicles]
+        return [self._wrap(Vehicle, x) for x in self._vehicles]
 
     def vehicle_state(self, vid) -> Optional[VehicleStateContainer]:
-        for item in self.vehicle_states:
-            if item.id == vid:
-                return item
-        return None
+        element = self._vehicle_state_index.get(vid)
+        if element is None:
+            return None
+        return self._wrap(VehicleStateContainer, element)
 
     @property
     def _vehicle_states(self) -> List[Element]:
@@ -234,54 +498,69 @@ class CC2XMLSave(CC2Save):
 
     @property
     def vehicle_states(self) -> List[VehicleStateContainer]:
-        return [VehicleStateContainer(element=x) for x in self._vehicle_states]
-
-    def new_vehicle(self, v_type: VehicleType):
-        # find next id
-        v_id = 0
-        for item in self.vehicles:
-            if item.id > v_id:
-                v_id = item.id + 1
-
-        v_next = int(self.scene_vehicles.attrib.get("id_counter", str(v_id)))
-        if v_next > v_id:
-            v_id = v_next
-        v_id += 1
-        self.scene_vehicles.attrib["id_counter"] = str(v_id)
-
-        v = Vehicle(element=None, cc2obj=self)
-        v.id = v_id
-        v.definition_index = v_type.value
-        v_state = VehicleStateContainer(element=None, cc2obj=self)
-        v_state.id = v_id
-
-        # set default altitude to 20, any lower and things on land probably appear inside terrain and vanish
-        # there is no "fall" damage so stuff just falls into place
-        v.set_location(y=20)
+        return [self._wrap(VehicleStateContainer, x) for x in self._vehicle_states]
+
+    def vehicle_table(self) -> VehicleTable:
+        """Numpy columns of the ids, teams, positions and state of every vehicle, see VehicleTable"""
+        return VehicleTable(self)
+
+    def new_vehicle(self, v_type: VehicleType) -> Vehicle:
+        return self.new_vehicles(v_type, 1)[0]
+
+    def new_vehicles(self, v_type: VehicleType, count: int) -> List[Vehicle]:
+        """Create count new vehicles of one type"""
+        # the scene keeps the last id given out, which may be higher than any vehicle left
+        counter = int(self.scene_vehicles.attrib.get("id_counter", "0"))
+        ids = self._vehicle_ids.allocate(count, floor=counter)
+        if not ids:
+            return []
+        self.scene_vehicles.attrib["id_counter"] = str(ids[-1])
 
         statevalues = get_default_state(v_type)
-        for statevalue in statevalues:
+        vpar = self.vehicles_parent
+        vspar = self.vehicle_states_parent
+        created = []
+        for v_id in ids:
+            v = Vehicle(element=None, cc2obj=self)
+            v.id = v_id
+            v.definition_index = v_type.value
+            v_state = VehicleStateContainer(element=None, cc2obj=self)
+            v_state.id = v_id
+
+            # set default altitude to 20, any lower and things on land probably appear inside terrain and vanish
+            # there is no "fall" damage so stuff just falls into place
+            v.set_location(y=20)
+
             # set initial state data
             data = v_state.data
-            for attrib_name in statevalue.attribs:
-                setattr(data, attrib_name, statevalue.count)
+            for statevalue in statevalues:
+                for attrib_name in statevalue.attribs:
+                    setattr(data, attrib_name, statevalue.count)
             v_state.data = data
 
-        vpar = self.vehicles_parent
-        vpar.append(v.element)
-        vspar = self.vehicle_states_parent
-        vspar.append(v_state.element)
+            vpar.append(v.element)
+            self._vehicle_index.add(v.element)
+            self.proxies.add(v)
+            vspar.append(v_state.element)
+            self._vehicle_state_index.add(v_state.element)
+            self.proxies.add(v_state)
+            created.append(v)
+
+        self.moved(created)
+        self.touched(created)
+        return created
 
-        return v
+    def _scan_respawn_ids(self) -> int:
+        found = self.roots[SCENE_ROOT].getroot().iterfind("./tiles/tiles/t/spawn_data/vehicles/v/data")
+        return max([int(x.attrib.get("respawn_id", 0)) for x in found], default=0)
+
+    def new_respawn_id(self) -> int:
+        """Reserve an id for a new vehicle spawn"""
+        return self._respawn_ids.allocate()[0]
 
     @property
     def next_respawn_id(self) -> int:
-        next_id = 0
-        for tile in self.tiles:
-            for item in tile.spawn_data.vehicles.items():
-                if item.data.respawn_id > next_id:
-                    next_id = item.data.respawn_id
-        return next_id + 1
+        return self._respawn_ids.last + 1
 
     @property
     def last_tile_id(self) -> int:
@@ -295,51 +574,267 @@ class CC2XMLSave(CC2Save):
     def next_tile_id(self) -> int:
         return 1 + self.last_tile_id
 
-    def export(self) -> str:
-
-        while len(self.tiles) > 63:
-            self.remove_tile(self.tiles[-1])
-
-        buf = StringIO()
-        buf.write(XML_START)
-        for root in ROOT_ORDER:
-            buf.write("\n")
-            subdoc = self.roots[root]
-            if subdoc.getroot() is not None:
-                subdoc.write(buf, encoding="unicode")
-            else:
+    def iter_export(self, report: Optional[Report] = None) -> Iterator[str]:
+        """Export the save as a series of text chunks, timing the export phase in report if given"""
+        if report is None:
+            report = Report()
+        with report.phase(PHASE_EXPORT):
+            if len(self._tiles) > 63:
+                self.remove_tiles(self.tiles[63:])
+
+            if self._weather is not None:
+                self._weather.flush()
+            report.count("states_written", self.embedded_states.flush())
+
+        return report.timed(PHASE_EXPORT, chunked(self._iter_export_pieces(report)))
+
+    def _iter_export_pieces(self, report: Report) -> Iterator[str]:
+        yield XML_START
+        for done, root in enumerate(ROOT_ORDER):
+            report.progress(PHASE_EXPORT, done, len(ROOT_ORDER))
+            yield "\n"
+            element = self.roots[root].getroot()
+            if element is None:
                 # empty, probably missiles
-                buf.write(f"<{root}></{root}>\n")
-
+                yield f"<{root}></{root}>\n"
+            elif self.splice is not None:
+                # only re-serialise what changed since loading
+                yield from self.splice.iter_emit(element, self.raw_spans)
+            else:
+                yield from self.raw_spans.expand(iter_element(element))
+                yield escape(element.tail or "")
+        report.progress(PHASE_EXPORT, len(ROOT_ORDER), len(ROOT_ORDER))
+
+    def export_to(self, fileobj: IO, progress: Optional[ProgressCallback] = None) -> Report:
+        """
+        Stream the save to a text or binary file object
+        :param fileobj:
+        :param progress: called with (phase, done, total) as each root is exported
+        :return: the time spent serialising and writing, and the number of characters written
+        """
+        report = Report(progress)
+        write_chunks(self.iter_export(report), fileobj, report=report)
+        self.export_report = report.finish()
+        logger.debug("exported in %.3fs", report.seconds)
+        return report
+
+    def export(self, progress: Optional[ProgressCallback] = None) -> str:
+        buf = StringIO()
+        self.export_to(buf, progress=progress)
         return buf.getvalue()
 
 
-def load_save_file(filename: str) -> CC2XMLSave:
-    """
-    Load each of the roots from the save file and return them as distinct documents
-    :param filename:
-    :return:
-    """
+def _load_roots_seek(filename: str, report: Optional[Report] = None) -> Dict[str, ElementTree.ElementTree]:
+    """Parse each root with a fresh parser, seeking back whenever the previous parser hits the next root"""
+    if report is None:
+        report = Report()
     resp = {}
-    buf = StoppableStringIO()
-    logger.info(f"open {filename}")
-    with open(filename, "r") as original:
-        # read as one big string so that we can use the offset
-        full_content = original.read()
-        buf.write(re.sub(r"[\r\n]", " ", full_content))
-    buf.seek(0, os.SEEK_SET)
+    buf = StoppableStringIO(report)
+    with report.phase(PHASE_READ):
+        with open(filename, "r") as original:
+            # read as one big string so that we can use the offset
+            full_content = original.read()
+            buf.size = buf.write(re.sub(r"[\r\n]", " ", full_content))
+        buf.seek(0, os.SEEK_SET)
     for root in ROOT_ORDER:
-        logger.info(f"parsing {root}")
+        logger.debug("parsing %s", root)
         pre_feed = None
         if buf.tell() != 0:
             pre_feed = XML_START
 
-        element = CC2ElementTree(buf, root, pre_feed=pre_feed).cc2parse(buf.tell())
+        with report.phase(root_phase(root)):
+            element = CC2ElementTree(buf, root, pre_feed=pre_feed).cc2parse(buf.tell())
         tree = ElementTree.ElementTree(element=element)
         resp[root] = tree
-    logger.info("loaded")
-    doc = CC2XMLSave()
-    doc.roots = resp
-    return doc
+    return resp
 
 
+def _load_roots_single_pass(filename: str, report: Optional[Report] = None) -> Dict[str, ElementTree.ElementTree]:
+    """Parse all the roots in one forward pass over the file"""
+    if report is None:
+        report = Report()
+    parser = CC2SinglePassParser()
+    size = os.path.getsize(filename)
+    done = 0
+    with open(filename, "r") as original:
+        while True:
+            with report.phase(PHASE_READ):
+                data = original.read(FEED_SIZE)
+            if not data:
+                break
+            with report.phase(PHASE_PARSE):
+                parser.feed(data)
+            done += len(data)
+            report.progress(PHASE_PARSE, done, size)
+    with report.phase(PHASE_PARSE):
+        found = parser.close()
+    return {root: ElementTree.ElementTree(element=found.get(root)) for root in ROOT_ORDER}
+
+
+def _feed_view(parser: CC2SinglePassParser, view: memoryview, start: int, end: int, report: Report) -> None:
+    pos = start
+    while pos < end:
+        with view[pos:min(pos + FEED_SIZE, end)] as chunk:
+            parser.feed(chunk)
+        pos += FEED_SIZE
+        report.progress(PHASE_PARSE, min(pos, end), len(view))
+
+
+def _load_roots_mmap(filename: str, raw_spans: Optional[RawSpans] = None,
+                     report: Optional[Report] = None) -> Dict[str, ElementTree.ElementTree]:
+    """
+    Parse all the roots in one forward pass, feeding the parser slices of the memory mapped file
+    :param filename:
+    :param raw_spans: if set, copy the weather grid values here and feed the parser their tokens instead
+    :param report: reading the file happens as it is parsed, so this only records the parse phase
+    :return:
+    """
+    if report is None:
+        report = Report()
+    parser = CC2SinglePassParser()
+    with report.phase(PHASE_PARSE):
+        with open(filename, "rb") as original:
+            if os.fstat(original.fileno()).st_size:
+                with mmap.mmap(original.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    # only the start of the file is copied, to find the end of the xml declaration
+                    pos = parser.skip_prolog(mapped[:1024])
+                    cuts = []
+                    if raw_spans is not None:
+                        cuts = find_weather_spans(mapped)
+                    with memoryview(mapped) as view:
+                        for span_start, span_end in cuts:
+                            _feed_view(parser, view, pos, span_start, report)
+                            parser.feed(raw_spans.add(mapped[span_start:span_end]))
+                            pos = span_end
+                        _feed_view(parser, view, pos, len(view), report)
+        found = parser.close()
+    return {root: ElementTree.ElementTree(element=found.get(root)) for root in ROOT_ORDER}
+
+
+def _feed_source(parser: CC2SpliceParser, start: int, end: int, report: Report) -> None:
+    pos = start
+    while pos < end:
+        parser.feed(pos, min(pos + FEED_SIZE, end))
+        pos += FEED_SIZE
+        report.progress(PHASE_PARSE, min(pos, end), len(parser.splice.source))
+
+
+def _load_roots_splice(filename: str,
+                       raw_spans: Optional[RawSpans] = None,
+                       report: Optional[Report] = None) -> Tuple[Dict[str, ElementTree.ElementTree], SpliceSource]:
+    """
+    Parse all the roots in one forward pass, keeping the file content and the byte range of each element
+    :param filename:
+    :param raw_spans: if set, copy the weather grid values here and feed the parser their tokens instead
+    :param report:
+    :return:
+    """
+    if report is None:
+        report = Report()
+    with report.phase(PHASE_READ):
+        with open(filename, "rb") as original:
+            source = original.read()
+    with report.phase(PHASE_PARSE):
+        parser = CC2SpliceParser(source, WRAPPER_ROOT)
+        pos = find_content_start(source[:1024])
+        cuts = []
+        if raw_spans is not None:
+            cuts = find_weather_spans(source)
+        for span_start, span_end in cuts:
+            _feed_source(parser, pos, span_start, report)
+            parser.feed_token(raw_spans.add(source[span_start:span_end]), span_start)
+            pos = span_end
+        _feed_source(parser, pos, len(source), report)
+        found, splice = parser.close()
+    return {root: ElementTree.ElementTree(element=found.get(root)) for root in ROOT_ORDER}, splice
+
+
+def _load_roots_parallel(filename: str, parallel: Optional[bool] = None,
+                         report: Optional[Report] = None) -> Dict[str, ElementTree.ElementTree]:
+    """Find where each root is and parse the big ones in worker processes"""
+    if report is None:
+        report = Report()
+    with report.phase(PHASE_READ):
+        with open(filename, "rb") as original:
+            source = original.read()
+    found = parse_roots(source, ROOT_ORDER, parallel=parallel, report=report)
+    return {root: ElementTree.ElementTree(element=found.get(root)) for root in ROOT_ORDER}
+
+
+def load_save_file(filename: str,
+                   engine: str = ENGINE_SINGLE_PASS,
+                   raw_spans: bool = False,
+                   cache: Union[bool, SnapshotCache] = False,
+                   progress: Optional[ProgressCallback] = None) -> CC2XMLSave:
+    """
+    Load each of the roots from the save file and return them as distinct documents
+    :param filename:
+    :param engine: one of LOADER_ENGINES, ENGINE_SEEK is the original re-seeking loader,
+                   ENGINE_MMAP parses the file without copying it into a string,
+                   ENGINE_SPLICE keeps the file so that export() only re-serialises what was changed,
+                   ENGINE_PARALLEL parses the scene and vehicles roots of large files in worker processes
+    :param raw_spans: pass the weather grid data through to export without parsing it
+                      (ENGINE_MMAP or ENGINE_SPLICE only)
+    :param cache: use a snapshot cache to skip parsing a file seen before, True for the per-user one in
+                  get_cache_dir(). Off by default so library callers do not fill the user's cache, pass
+                  True (as the editor does) to reopen saves faster. Only used by ENGINE_SINGLE_PASS,
+                  ENGINE_MMAP and ENGINE_PARALLEL
+    :param progress: called with (phase, done, total) as the file is parsed
+    :return: the save, with the phase timings and counters of the load in load_report
+    """
+    logger.info("open %s", filename)
+    report = Report(progress)
+    doc = CC2XMLSave()
+    if raw_spans and engine not in [ENGINE_MMAP, ENGINE_SPLICE]:
+        raise ValueError(f"raw spans are not supported by loader engine {engine}")
+
+    if cache is True:
+        cache = default_snapshot_cache()
+    if engine not in [ENGINE_SINGLE_PASS, ENGINE_MMAP, ENGINE_PARALLEL]:
+        cache = None
+    # parsed trees are the same for both engines, raw spans are not
+    variant = "raw" if raw_spans else "parsed"
+    key = None
+    snapshot = None
+    if cache:
+        with report.phase(PHASE_CACHE):
+            key = cache.file_key(filename)
+            snapshot = cache.get(filename, variant, key)
+
+    if snapshot is not None:
+        logger.info("loaded from snapshot cache")
+        report.count("cache_hits")
+        found, doc.raw_spans.spans = snapshot
+        resp = {root: ElementTree.ElementTree(element=found.get(root)) for root in ROOT_ORDER}
+    elif engine == ENGINE_SPLICE:
+        resp, doc.splice = _load_roots_splice(filename, raw_spans=doc.raw_spans if raw_spans else None,
+                                              report=report)
+    elif raw_spans:
+        resp = _load_roots_mmap(filename, raw_spans=doc.raw_spans, report=report)
+    elif engine == ENGINE_SEEK:
+        resp = _load_roots_seek(filename, report=report)
+    elif engine == ENGINE_SINGLE_PASS:
+        resp = _load_roots_single_pass(filename, report=report)
+    elif engine == ENGINE_MMAP:
+        resp = _load_roots_mmap(filename, report=report)
+    elif engine == ENGINE_PARALLEL:
+        resp = _load_roots_parallel(filename, report=report)
+    else:
+        raise ValueError(f"unknown loader engine {engine}")
+
+    if cache and snapshot is None:
+        with report.phase(PHASE_CACHE):
+            cache.put(filename, variant, key, {root: resp[root].getroot() for root in ROOT_ORDER},
+                      doc.raw_spans.spans)
+
+    with report.phase(PHASE_BUILD):
+        doc.roots = resp
+        report.count("bytes", os.path.getsize(filename))
+        report.count("raw_spans", len(doc.raw_spans))
+        for root in ROOT_ORDER:
+            element = resp[root].getroot()
+            if element is not None:
+                report.count("elements", sum(1 for _ in element.iter()))
+    doc.load_report = report.finish()
+    logger.info("loaded %s in %.3fs", filename, report.seconds)
+    return doc
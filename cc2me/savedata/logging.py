@@ -1,4 +1,10 @@
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("cc2me")
+# nothing is printed unless the application configures logging, see enable_logging()
+logger.addHandler(logging.NullHandler())
+
+
+def enable_logging(level: int = logging.INFO):
+    """Print cc2me log messages on stderr"""
+    logging.basicConfig(level=level)
@@ -0,0 +1,161 @@
+"""Parse the roots of a save concurrently after finding where each one starts and ends"""
+import atexit
+import concurrent.futures
+from typing import Dict, Tuple, List, Optional
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element
+
+from .instrumentation import Report, PHASE_PARSE, root_phase
+
+# roots worth sending to another process, the others are parsed while we wait
+PARALLEL_ROOTS = ["scene", "vehicles"]
+
+# files smaller than this are parsed in sequence. Sending the parsed trees back from the workers costs
+# more than parsing them, a 7.7 MB save took 0.14s in sequence and 0.4s with the (warm) pool, so only
+# very large files are worth it.
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+
+_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+
+def _tag_at(data: bytes, pos: int, name: bytes) -> bool:
+    """True if there is a start tag for name (not just a longer name) at pos"""
+    after = pos + 1 + len(name)
+    return data.startswith(b"<" + name, pos) and data[after:after + 1] in (b" ", b"\t", b"\r", b"\n", b">", b"/")
+
+
+def _end_tag_at(data: bytes, pos: int, name: bytes) -> bool:
+    """True if there is an end tag for name (not just a longer name) at pos"""
+    after = pos + 2 + len(name)
+    return data.startswith(b"</" + name, pos) and data[after:after + 1] in (b" ", b"\t", b"\r", b"\n", b">")
+
+
+def _start_tag_end(data: bytes, pos: int) -> Tuple[int, bool]:
+    """Return the offset after the start tag at pos, and if it is an empty element"""
+    end = pos
+    while True:
+        end = data.index(b">", end) + 1
+        # a ">" inside a quoted attribute value does not end the tag
+        tag = data[pos:end]
+        if tag.count(b"\"") % 2 == 0 and tag.count(b"'") % 2 == 0:
+            return end, data[end - 2:end] == b"/>"
+
+
+def find_root_spans(data: bytes, roots: List[str]) -> Dict[str, Tuple[int, int]]:
+    """
+    Find the byte range of each top level root of a save, which must be in the given order
+    :param data: the save
+    :param roots: root names in the order they appear
+    :return: root name -> (start, end)
+    """
+    spans = {}
+    pos = 0
+    for root in roots:
+        name = root.encode()
+        start = data.find(b"<" + name, pos)
+        while start != -1 and not _tag_at(data, start, name):
+            start = data.find(b"<" + name, start + 1)
+        if start == -1:
+            continue
+        try:
+            pos = _root_end(data, start, name)
+        except ValueError:
+            # the file ends inside the root
+            error = ElementTree.ParseError(f"root {root} starting at offset {start} is not closed")
+            error.position = (data.count(b"\n", 0, start) + 1, start - (data.rfind(b"\n", 0, start) + 1))
+            raise error
+        spans[root] = (start, pos)
+    return spans
+
+
+def _root_end(data: bytes, start: int, name: bytes) -> int:
+    """The offset after the end of the root element starting at start, ValueError if there is none"""
+    pos, empty = _start_tag_end(data, start)
+    depth = 0 if empty else 1
+    # the vehicles root has a vehicles element inside it, so count same named elements
+    while depth:
+        opening = data.find(b"<" + name, pos)
+        closing = data.index(b"</" + name, pos)
+        while not _end_tag_at(data, closing, name):
+            closing = data.index(b"</" + name, closing + 1)
+        if opening != -1 and opening < closing:
+            pos, empty = _start_tag_end(data, opening)
+            if _tag_at(data, opening, name) and not empty:
+                depth += 1
+        else:
+            pos = data.index(b">", closing) + 1
+            depth -= 1
+    return pos
+
+
+def root_tails(data: bytes, spans: Dict[str, Tuple[int, int]]) -> Dict[str, str]:
+    """The text after each root up to the next one (or the end of the file), as the other engines keep it"""
+    ordered = sorted(spans.items(), key=lambda item: item[1][0])
+    tails = {}
+    for number, (root, (_, end)) in enumerate(ordered):
+        following = ordered[number + 1][1][0] if number + 1 < len(ordered) else len(data)
+        tails[root] = data[end:following].decode("utf-8")
+    return tails
+
+
+def parse_root(data: bytes) -> Element:
+    return ElementTree.fromstring(data)
+
+
+def get_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """The worker pool is started on first use and kept for later loads"""
+    global _pool
+    if _pool is None:
+        _pool = concurrent.futures.ProcessPoolExecutor(max_workers=len(PARALLEL_ROOTS))
+        atexit.register(shutdown_pool)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def parse_roots(data: bytes, roots: List[str], parallel: Optional[bool] = None,
+                report: Optional[Report] = None) -> Dict[str, Element]:
+    """
+    Parse each root of a save
+    :param data: the save
+    :param roots: root names in the order they appear
+    :param parallel: parse PARALLEL_ROOTS in worker processes, by default only if data is big enough
+    :param report: record the time taken by each root here, for roots parsed by the workers this is the
+                   time spent waiting for them
+    :return:
+    """
+    if parallel is None:
+        parallel = len(data) >= PARALLEL_MIN_SIZE
+    if report is None:
+        report = Report()
+    with report.phase("scan"):
+        spans = find_root_spans(data, roots)
+    futures = {}
+    if parallel:
+        pool = get_pool()
+        for root in PARALLEL_ROOTS:
+            if root in spans:
+                start, end = spans[root]
+                futures[root] = pool.submit(parse_root, data[start:end])
+    found = {}
+    done = 0
+    for root, (start, end) in spans.items():
+        if root not in futures:
+            with report.phase(root_phase(root)):
+                found[root] = parse_root(data[start:end])
+            done += end - start
+            report.progress(PHASE_PARSE, done, len(data))
+    for root, future in futures.items():
+        with report.phase(root_phase(root)):
+            found[root] = future.result()
+        start, end = spans[root]
+        done += end - start
+        report.progress(PHASE_PARSE, done, len(data))
+    for root, tail in root_tails(data, spans).items():
+        found[root].tail = tail
+    return found
@@ -0,0 +1,153 @@
+"""Measure the time and memory cost of loading saves with each loader engine, and of the save proxy objects"""
+import argparse
+import dataclasses
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from typing import Optional, List, Iterable, Dict, Callable, Any
+
+from .loader import load_save_file, LOADER_ENGINES
+from .types.objects import get_unit
+from .types.tiles import Tile
+from .types.utils import Transform
+from .types.vehicles.vehicle import Vehicle
+from .types.vehicles.vehicle_state import VehicleStateContainer
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # not available on windows
+    resource = None
+
+
+@dataclasses.dataclass
+class LoadMeasurement:
+    engine: str
+    seconds: float
+    peak_traced: int
+    peak_rss: Optional[int] = None
+    # seconds spent in each phase of the load, see Report
+    phases: Dict[str, float] = dataclasses.field(default_factory=dict)
+
+    def __str__(self):
+        rss = "n/a"
+        if self.peak_rss is not None:
+            rss = f"{self.peak_rss / 1048576:.1f} MiB"
+        return (f"{self.engine:<12} {self.seconds:8.3f} s"
+                f"  peak alloc {self.peak_traced / 1048576:.1f} MiB"
+                f"  peak rss {rss}")
+
+
+@dataclasses.dataclass
+class ProxyMeasurement:
+    name: str
+    count: int
+    bytes_each: float
+    construct_ns: float
+
+    def __str__(self):
+        return f"{self.name:<24} {self.bytes_each:8.1f} bytes {self.construct_ns:8.0f} ns"
+
+
+def get_peak_rss() -> Optional[int]:
+    """Get the peak resident set size of this process in bytes, if the platform can tell us"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak
+    return peak * 1024
+
+
+def measure_load(filename: str, engine: str) -> LoadMeasurement:
+    """
+    Load a save in this process and measure it.
+    The peak rss only means something if this process has not already done something bigger,
+    use compare_engines() to measure each engine in a fresh process.
+    """
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        loaded = load_save_file(filename, engine=engine, cache=False)
+        seconds = time.perf_counter() - started
+        _, peak_traced = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return LoadMeasurement(engine=engine, seconds=seconds, peak_traced=peak_traced, peak_rss=get_peak_rss(),
+                           phases=loaded.load_report.phases)
+
+
+def compare_engines(filename: str, engines: Optional[Iterable[str]] = None) -> List[LoadMeasurement]:
+    """Measure each loader engine in its own fresh process"""
+    if engines is None:
+        engines = LOADER_ENGINES
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for engine in engines:
+        with ctx.Pool(1) as pool:
+            results.append(pool.apply(measure_load, (filename, engine)))
+    return results
+
+
+def measure_proxy(name: str, make: Callable[[int], Any], count: int) -> ProxyMeasurement:
+    """Measure the memory held by and the time taken to make count proxies"""
+    items = [None] * count
+    started = time.perf_counter()
+    for i in range(count):
+        items[i] = make(i)
+    seconds = time.perf_counter() - started
+    items = [None] * count
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for i in range(count):
+            items[i] = make(i)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return ProxyMeasurement(name=name, count=count, bytes_each=(after - before) / count,
+                            construct_ns=seconds * 1e9 / count)
+
+
+def measure_proxies(filename: str, count: int = 20000) -> List[ProxyMeasurement]:
+    """Measure making new (uncached) proxies for the elements of a save"""
+    doc = load_save_file(filename, cache=False)
+    vehicles = [x.element for x in doc.vehicles]
+    transforms = [x.transform.element for x in doc.vehicles]
+    states = [x.element for x in doc.vehicle_states]
+    tiles = [x.element for x in doc.tiles]
+    return [
+        measure_proxy("Vehicle", lambda i: Vehicle(vehicles[i % len(vehicles)], cc2obj=doc), count),
+        measure_proxy("Transform", lambda i: Transform(transforms[i % len(transforms)], cc2obj=doc), count),
+        measure_proxy("VehicleStateContainer", lambda i: VehicleStateContainer(states[i % len(states)], cc2obj=doc),
+                      count),
+        measure_proxy("Tile", lambda i: Tile(tiles[i % len(tiles)], cc2obj=doc), count),
+        measure_proxy("Unit", lambda i: get_unit(Vehicle(vehicles[i % len(vehicles)], cc2obj=doc)), count),
+    ]
+
+
+def run(args=None):
+    parser = argparse.ArgumentParser(description=__doc__, prog="cc2me.savedata.profiling")
+    parser.add_argument("--engine", action="append", choices=LOADER_ENGINES,
+                        help="engine to measure, may be given more than once (default all)")
+    parser.add_argument("--phases", action="store_true", help="also show the time spent in each phase")
+    parser.add_argument("--proxies", action="store_true",
+                        help="measure the size and construction time of proxy objects instead")
+    parser.add_argument("filename", nargs="+")
+    opts = parser.parse_args(args)
+    for filename in opts.filename:
+        print(filename)
+        if opts.proxies:
+            for result in measure_proxies(filename):
+                print(f"  {result}")
+            continue
+        for result in compare_engines(filename, opts.engine):
+            print(f"  {result}")
+            if opts.phases:
+                for phase, seconds in result.phases.items():
+                    print(f"    {phase:<16} {seconds:8.3f} s")
+
+
+if __name__ == "__main__":
+    run()
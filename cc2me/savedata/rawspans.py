@@ -0,0 +1,102 @@
+"""
+Pass large opaque attribute values through a load and export without parsing them.
+
+The weather grids in the scene root are single hex attributes of up to a few MB each. In raw span
+mode the loader copies the bytes of these values aside and feeds the parser a short token instead,
+the exporter swaps the original bytes back in when it writes the token.
+"""
+from typing import Dict, List, Tuple, Optional, Set, Iterable, Iterator
+
+# private use character, never written by the game
+RAW_MARK = "\ue000"
+
+WEATHER_TAG = b"weather"
+RAW_SPAN_TAGS = [b"velocity", b"pressure", b"properties"]
+RAW_SPAN_ATTRIB = b"data"
+
+
+class RawSpans:
+    """The raw attribute values of a save, keyed by the token left in the element tree"""
+    def __init__(self):
+        self.spans: Dict[str, bytes] = {}
+        # tokens given a new value since loading
+        self.modified: Set[str] = set()
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, token) -> bool:
+        return token in self.spans
+
+    def add(self, value: bytes) -> str:
+        token = f"{RAW_MARK}raw-span-{len(self.spans)}{RAW_MARK}"
+        self.spans[token] = value
+        return token
+
+    def get(self, token: str) -> Optional[bytes]:
+        return self.spans.get(token)
+
+    def expand(self, pieces: Iterable[str]) -> Iterator[str]:
+        """Replace the tokens in pieces of exported text with their original values"""
+        for text in pieces:
+            if RAW_MARK not in text:
+                yield text
+                continue
+            # tokens are at the odd positions
+            for i, part in enumerate(text.split(RAW_MARK)):
+                if i % 2:
+                    yield self.spans[f"{RAW_MARK}{part}{RAW_MARK}"].decode("ascii")
+                elif part:
+                    yield part
+
+    def set(self, token: str, value: bytes):
+        if token not in self.spans:
+            raise KeyError(token)
+        self.spans[token] = value
+        self.modified.add(token)
+
+
+def is_raw_token(value: Optional[str]) -> bool:
+    return value is not None and value.startswith(RAW_MARK)
+
+
+def _start_tags(data, tag: bytes, start: int, end: int) -> Iterator[int]:
+    """The offsets of each start tag with this exact name between start and end"""
+    pos = data.find(b"<" + tag, start, end)
+    while pos != -1:
+        after = pos + len(tag) + 1
+        following = data[after:after + 1]
+        if following in (b">", b"/") or following.isspace():
+            yield pos
+        pos = data.find(b"<" + tag, after, end)
+
+
+def find_weather_spans(data) -> List[Tuple[int, int]]:
+    """
+    Find the offsets of the weather grid data values in a save buffer (bytes or mmap)
+    :param data:
+    :return: list of (start, end) offsets of each attribute value, without the quotes
+    """
+    spans = []
+    for weather in _start_tags(data, WEATHER_TAG, 0, len(data)):
+        # each tag search stays inside this weather element
+        weather_end = data.find(b"</" + WEATHER_TAG + b">", weather)
+        if weather_end == -1:
+            break
+        for tag in RAW_SPAN_TAGS:
+            for start in _start_tags(data, tag, weather, weather_end):
+                tag_end = data.find(b">", start, weather_end)
+                if tag_end == -1:
+                    continue
+                # must be a whole attribute name inside this start tag
+                attrib = data.find(RAW_SPAN_ATTRIB + b"=\"", start, tag_end)
+                while attrib != -1 and not data[attrib - 1:attrib].isspace():
+                    attrib = data.find(RAW_SPAN_ATTRIB + b"=\"", attrib + 1, tag_end)
+                if attrib == -1:
+                    continue
+                value_start = attrib + len(RAW_SPAN_ATTRIB) + 2
+                value_end = data.find(b"\"", value_start, weather_end)
+                if value_end != -1:
+                    spans.append((value_start, value_end))
+    spans.sort()
+    return spans
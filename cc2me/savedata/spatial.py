@@ -0,0 +1,167 @@
+"""A uniform grid over the world x/z positions of the things in a save, for region and proximity queries"""
+import math
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+# min_x, min_z, max_x, max_z, a point is a box of no size
+Box = Tuple[float, float, float, float]
+Cell = Tuple[int, int]
+
+# islands are 4-14 km across and most units sit near one
+DEFAULT_CELL_SIZE = 2000.0
+
+
+def box_distance(box: Box, x: float, z: float) -> float:
+    """Distance from a point to the nearest part of a box, 0 if it is inside"""
+    dx = max(box[0] - x, 0.0, x - box[2])
+    dz = max(box[1] - z, 0.0, z - box[3])
+    return math.hypot(dx, dz)
+
+
+class SpatialGrid:
+    """
+    Find keys by position. Each key has a box and a kind, and is listed in every grid cell its box touches.
+    """
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells: Dict[Cell, Set[Hashable]] = {}
+        self.boxes: Dict[Hashable, Box] = {}
+        self.kinds: Dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.boxes
+
+    def _cell(self, x: float, z: float) -> Cell:
+        return math.floor(x / self.cell_size), math.floor(z / self.cell_size)
+
+    def _cells(self, box: Box) -> Iterator[Cell]:
+        x0, z0 = self._cell(box[0], box[1])
+        x1, z1 = self._cell(box[2], box[3])
+        for cx in range(x0, x1 + 1):
+            for cz in range(z0, z1 + 1):
+                yield cx, cz
+
+    def insert(self, key: Hashable, box: Box, kind: Any = None):
+        """Add a key, or move it if it is already here"""
+        if key in self.boxes:
+            if self.boxes[key] == box:
+                self.kinds[key] = kind
+                return
+            self.remove(key)
+        self.boxes[key] = box
+        self.kinds[key] = kind
+        for cell in self._cells(box):
+            self.cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key: Hashable):
+        box = self.boxes.pop(key, None)
+        if box is None:
+            return
+        del self.kinds[key]
+        for cell in self._cells(box):
+            found = self.cells.get(cell)
+            if found is not None:
+                found.discard(key)
+                if not found:
+                    del self.cells[cell]
+
+    def _accept(self, kinds: Optional[Tuple[Any, ...]]) -> Callable[[Hashable], bool]:
+        if kinds is None:
+            return lambda key: True
+        return lambda key: self.kinds[key] in kinds
+
+    def query_box(self, box: Box, kinds: Optional[Tuple[Any, ...]] = None) -> List[Hashable]:
+        """Keys whose boxes overlap box"""
+        accept = self._accept(kinds)
+        seen = set()
+        found = []
+        for cell in self._cells(box):
+            for key in self.cells.get(cell, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                other = self.boxes[key]
+                if other[0] <= box[2] and box[0] <= other[2] and other[1] <= box[3] and box[1] <= other[3] \
+                        and accept(key):
+                    found.append(key)
+        return found
+
+    def query_radius(self, x: float, z: float, radius: float,
+                     kinds: Optional[Tuple[Any, ...]] = None) -> List[Hashable]:
+        """Keys whose boxes are within radius of a point"""
+        candidates = self.query_box((x - radius, z - radius, x + radius, z + radius), kinds)
+        return [key for key in candidates if box_distance(self.boxes[key], x, z) <= radius]
+
+    def nearest(self, x: float, z: float, count: int = 1,
+                kinds: Optional[Tuple[Any, ...]] = None) -> List[Hashable]:
+        """The count keys closest to a point, nearest first"""
+        if count <= 0:
+            return []
+        accept = self._accept(kinds)
+        cx, cz = self._cell(x, z)
+        seen = set()
+        found: List[Tuple[float, Hashable]] = []
+        searched = 0
+        ring = 0
+        while True:
+            for cell in self._ring(cx, cz, ring):
+                searched += 1
+                for key in self.cells.get(cell, ()):
+                    if key not in seen:
+                        seen.add(key)
+                        if accept(key):
+                            found.append((box_distance(self.boxes[key], x, z), key))
+            # anything in a further ring is at least this far away
+            reach = ring * self.cell_size
+            found.sort(key=lambda item: item[0])
+            if len(found) >= count and found[count - 1][0] <= reach:
+                break
+            if searched >= len(self.cells):
+                # the rest of the grid is sparse, look at everything not seen yet
+                found.extend((box_distance(box, x, z), key) for key, box in self.boxes.items()
+                             if key not in seen and accept(key))
+                found.sort(key=lambda item: item[0])
+                break
+            ring += 1
+        return [key for _, key in found[:count]]
+
+    @staticmethod
+    def _ring(cx: int, cz: int, ring: int) -> Iterator[Cell]:
+        """The cells at exactly ring steps (in x or z) from a cell"""
+        if ring == 0:
+            yield cx, cz
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cz - ring
+            yield cx + dx, cz + ring
+        for dz in range(-ring + 1, ring):
+            yield cx - ring, cz + dz
+            yield cx + ring, cz + dz
+
+
+def _point(element: Optional[Any], x: str = "x", z: str = "z") -> Tuple[float, float]:
+    if element is None:
+        return 0.0, 0.0
+    return float(element.attrib.get(x, 0)), float(element.attrib.get(z, 0))
+
+
+def vehicle_box(element) -> Box:
+    """The position of a vehicle element"""
+    x, z = _point(element.find("transform"), "tx", "tz")
+    return x, z, x, z
+
+
+def tile_box(element) -> Box:
+    """The area covered by a tile element, its bounds are relative to its world position"""
+    x, z = _point(element.find("world_position"))
+    min_x, min_z = _point(element.find("bounds/min"))
+    max_x, max_z = _point(element.find("bounds/max"))
+    return x + min_x, z + min_z, x + max_x, z + max_z
+
+
+def spawn_box(element) -> Box:
+    """The position of a tile vehicle spawn element"""
+    x, z = _point(element.find("data/world_position"))
+    return x, z, x, z
@@ -0,0 +1,189 @@
+"""
+Incremental export that reuses unchanged byte ranges of the original save.
+
+The splice parser records the source byte range of every element down to SPLICE_DEPTH (the roots are
+depth 1, so this covers each tile `t`, vehicle `v` and `vehicle_states/v` and their direct children)
+together with a fingerprint of its content. On export an element whose fingerprint still matches is
+copied verbatim from the source, anything else is serialised again from the element tree.
+"""
+import re
+from typing import Dict, List, Optional, Tuple, Iterator
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element
+from xml.parsers import expat
+from xml.sax.saxutils import escape
+
+from .export import start_tag, serialize
+from .rawspans import RawSpans
+
+SPLICE_DEPTH = 4
+
+# a whole start tag, quoted attribute values may contain ">"
+START_TAG = re.compile(rb"<(?:[^\"'>]|\"[^\"]*\"|'[^']*')*>")
+
+
+def content_fingerprint(element: Element) -> int:
+    """Hash the whole content of an element"""
+    return hash(tuple((x.tag, tuple(x.attrib.items()), x.text, x.tail) for x in element.iter()))
+
+
+def own_fingerprint(element: Element) -> int:
+    """Hash an element without the content of its children (but with which children it has)"""
+    return hash((element.tag, tuple(element.attrib.items()), element.text,
+                 tuple((id(x), x.tail) for x in element)))
+
+
+class SpliceNode:
+    def __init__(self, depth: int, start: int):
+        self.depth = depth
+        self.start = start
+        self.end = start
+        self.fingerprint = 0
+
+    @property
+    def opaque(self) -> bool:
+        """Children of this node are not tracked"""
+        return self.depth >= SPLICE_DEPTH
+
+
+class SpliceSource:
+    """The original bytes of a save and where each tracked element came from"""
+
+    def __init__(self, source: bytes):
+        self.source = source
+        self.nodes: Dict[Element, SpliceNode] = {}
+        # raw span token -> nodes containing it
+        self.token_nodes: Dict[str, List[SpliceNode]] = {}
+
+    def fingerprint(self, element: Element, node: SpliceNode) -> int:
+        if node.opaque:
+            return content_fingerprint(element)
+        return own_fingerprint(element)
+
+    def seal(self):
+        """Record the fingerprints of all the nodes once parsing is complete"""
+        for element, node in self.nodes.items():
+            node.fingerprint = self.fingerprint(element, node)
+
+    def changed(self, element: Element, node: SpliceNode, dirty: set) -> bool:
+        return id(node) in dirty or self.fingerprint(element, node) != node.fingerprint
+
+    def iter_emit(self, element: Element, raw_spans: Optional[RawSpans] = None) -> Iterator[str]:
+        """Serialise an element (without its tail) in pieces, copying unchanged parts from the source"""
+        dirty = set()
+        if raw_spans is not None:
+            for token in raw_spans.modified:
+                dirty.update(id(x) for x in self.token_nodes.get(token, []))
+        pieces = self._emit(element, dirty)
+        if raw_spans is not None:
+            pieces = raw_spans.expand(pieces)
+        return pieces
+
+    def _copy(self, start: int, end: int) -> str:
+        return self.source[start:end].decode("utf-8")
+
+    def _emit(self, element: Element, dirty: set) -> Iterator[str]:
+        node = self.nodes.get(element)
+        if node is None:
+            yield serialize(element)
+        elif not self.changed(element, node, dirty):
+            if node.opaque:
+                yield self._copy(node.start, node.end)
+            else:
+                # the start tag, text and tails are the same but the children might not be
+                pos = node.start
+                for child in element:
+                    child_node = self.nodes[child]
+                    yield self._copy(pos, child_node.start)
+                    yield from self._emit(child, dirty)
+                    pos = child_node.end
+                yield self._copy(pos, node.end)
+        elif node.opaque or not len(element):
+            yield serialize(element)
+        else:
+            yield start_tag(element)
+            yield escape(element.text or "")
+            for child in element:
+                yield from self._emit(child, dirty)
+                yield escape(child.tail or "")
+            yield f"</{element.tag}>"
+
+
+class CC2SpliceParser:
+    """
+    Parse the roots of a save held in memory and record where the tracked elements came from.
+
+    Like CC2SinglePassParser the roots are fed inside a synthetic wrapper element, expat is driven
+    directly so that we can ask it for the byte offset of each element.
+    """
+    def __init__(self, source: bytes, wrapper: str):
+        self.splice = SpliceSource(source)
+        self.builder = ElementTree.TreeBuilder()
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self._start
+        self.parser.EndElementHandler = self._end
+        self.parser.CharacterDataHandler = self.builder.data
+        self.depth = -1
+        self.open: List[Optional[SpliceNode]] = []
+        # (fed offset, source offset, length) of each piece of source fed to the parser
+        self.segments: List[Tuple[int, int, int]] = []
+        self.segment = 0
+        self.fed = 0
+        self.wrapper = wrapper
+        self._feed(f"<{wrapper}>".encode())
+        self.tokens: List[Tuple[str, int]] = []
+
+    def _feed(self, data: bytes, final: bool = False):
+        self.parser.Parse(data, final)
+        self.fed += len(data)
+
+    def _source_offset(self, fed: int) -> int:
+        # events arrive in order, so walk forwards through the segments
+        while True:
+            fed_start, src_start, length = self.segments[self.segment]
+            if fed <= fed_start + length or self.segment == len(self.segments) - 1:
+                return src_start + fed - fed_start
+            self.segment += 1
+
+    def _start(self, tag: str, attrs: dict):
+        element = self.builder.start(tag, attrs)
+        self.depth += 1
+        node = None
+        if 0 < self.depth <= SPLICE_DEPTH:
+            start = self._source_offset(self.parser.CurrentByteIndex)
+            node = SpliceNode(self.depth, start)
+            self.splice.nodes[element] = node
+            pos = START_TAG.match(self.splice.source, start).end()
+            if self.splice.source[pos - 2:pos] == b"/>":
+                # empty element
+                node.end = pos
+        self.open.append(node)
+
+    def _end(self, tag: str):
+        self.builder.end(tag)
+        self.depth -= 1
+        node = self.open.pop()
+        if node is not None and node.end == node.start:
+            end_tag = self._source_offset(self.parser.CurrentByteIndex)
+            node.end = self.splice.source.index(b">", end_tag) + 1
+
+    def feed(self, start: int, end: int):
+        """Feed part of the source"""
+        if end > start:
+            self.segments.append((self.fed, start, end - start))
+            self._feed(self.splice.source[start:end])
+
+    def feed_token(self, token: str, start: int):
+        """Feed a raw span token in place of the source starting at start"""
+        self.tokens.append((token, start))
+        self._feed(token.encode())
+
+    def close(self) -> Tuple[Dict[str, Element], SpliceSource]:
+        self._feed(f"</{self.wrapper}>".encode(), final=True)
+        wrapper = self.builder.close()
+        for token, start in self.tokens:
+            self.splice.token_nodes[token] = [
+                x for x in self.splice.nodes.values() if x.start <= start < x.end]
+        self.splice.seal()
+        return {x.tag: x for x in wrapper}, self.splice
@@ -0,0 +1,150 @@
+"""
+Read a short summary of a save without loading all of it.
+
+Only the start of the scene root (the tiles and teams, which come before the large weather grids) is
+parsed, the vehicles are counted by scanning their start tags.
+"""
+import dataclasses
+import mmap
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from xml.etree.ElementTree import Element
+from xml.parsers import expat
+
+from .constants import VehicleType
+from .types.teams import Team
+from .types.tiles import Tile
+
+SCENE_TAG = b"<scene"
+SCENE_END_TAG = b"</scene>"
+VEHICLES_TAG = b"<vehicles"
+VEHICLE_STATES_TAG = b"<vehicle_states"
+
+TILES_PATH = ("scene", "tiles")
+TILE_PATH = ("scene", "tiles", "tiles", "t")
+TEAM_PATH = ("scene", "teams", "teams", "t")
+# everything we want is before this
+WEATHER_PATH = ("scene", "weather")
+
+# the start tag of each vehicle, the vehicles root has no other "v" elements
+VEHICLE_START = re.compile(rb"<v\s([^>]*)>")
+ATTRIBUTE = re.compile(rb"([\w:-]+)\s*=\s*\"([^\"]*)\"")
+
+FEED_SIZE = 65536
+
+
+class _SceneDone(Exception):
+    pass
+
+
+@dataclasses.dataclass
+class SaveSummary:
+    """
+    What is in a save. The tiles and teams only have their own attributes,
+    their child elements (spawn data, bounds etc) are not loaded.
+    """
+    filename: str
+    world_seed: Optional[int] = None
+    tiles: List[Tile] = dataclasses.field(default_factory=list)
+    teams: List[Team] = dataclasses.field(default_factory=list)
+    # definition index -> number of vehicles
+    vehicles: Dict[int, int] = dataclasses.field(default_factory=dict)
+    # team id -> number of vehicles
+    team_vehicles: Dict[int, int] = dataclasses.field(default_factory=dict)
+
+    @property
+    def vehicle_count(self) -> int:
+        return sum(self.vehicles.values())
+
+    @property
+    def vehicle_types(self) -> Dict[str, int]:
+        """Number of vehicles of each type, by name"""
+        return {VehicleType.get_name(x): count for x, count in sorted(self.vehicles.items())}
+
+    @property
+    def team_tiles(self) -> Dict[int, int]:
+        """Number of tiles held by each team"""
+        counts = {}
+        for tile in self.tiles:
+            counts[tile.team_control] = counts.get(tile.team_control, 0) + 1
+        return counts
+
+    def describe(self) -> str:
+        """A one line description for save slot lists"""
+        players = [x for x in self.teams if not x.is_neutral]
+        return f"{len(self.tiles)} islands, {len(players)} teams, {self.vehicle_count} units"
+
+
+class _SceneReader:
+    """Collect the tile and team attributes from the start of the scene root"""
+    def __init__(self, summary: SaveSummary):
+        self.summary = summary
+        self.path: List[str] = []
+        self.parser = expat.ParserCreate()
+        self.parser.StartElementHandler = self._start
+        self.parser.EndElementHandler = self._end
+
+    def _start(self, tag: str, attrs: dict):
+        self.path.append(tag)
+        path = tuple(self.path)
+        if path == TILE_PATH:
+            self.summary.tiles.append(Tile(element=Element("t", attrs)))
+        elif path == TEAM_PATH:
+            self.summary.teams.append(Team(element=Element("t", attrs)))
+        elif path == TILES_PATH and "world_seed" in attrs:
+            self.summary.world_seed = int(attrs["world_seed"])
+        elif path == WEATHER_PATH:
+            raise _SceneDone()
+
+    def _end(self, tag: str):
+        self.path.pop()
+        if not self.path:
+            raise _SceneDone()
+
+    def read(self, data, start: int, end: int) -> None:
+        pos = start
+        try:
+            while pos < end:
+                self.parser.Parse(data[pos:min(pos + FEED_SIZE, end)], False)
+                pos += FEED_SIZE
+        except _SceneDone:
+            pass
+
+
+def _count_vehicles(data, start: int, end: int) -> Tuple[Dict[int, int], Dict[int, int]]:
+    by_definition = {}
+    by_team = {}
+    for match in VEHICLE_START.finditer(data, start, end):
+        attrs = dict(ATTRIBUTE.findall(match.group(1)))
+        definition = int(attrs.get(b"definition_index", -1))
+        team = int(attrs.get(b"team_id", -1))
+        by_definition[definition] = by_definition.get(definition, 0) + 1
+        by_team[team] = by_team.get(team, 0) + 1
+    return by_definition, by_team
+
+
+def load_save_summary(filename: str) -> SaveSummary:
+    """
+    Read the tiles, teams and vehicle counts of a save
+    :param filename:
+    :return:
+    """
+    summary = SaveSummary(filename=filename)
+    with open(filename, "rb") as original:
+        if not os.fstat(original.fileno()).st_size:
+            raise ValueError(f"{filename} is empty")
+        with mmap.mmap(original.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            scene = mapped.find(SCENE_TAG)
+            if scene == -1:
+                raise ValueError(f"{filename} has no scene")
+            _SceneReader(summary).read(mapped, scene, len(mapped))
+
+            scene_end = mapped.find(SCENE_END_TAG, scene)
+            vehicles = mapped.find(VEHICLES_TAG, scene_end) if scene_end != -1 else -1
+            if vehicles != -1:
+                vehicles_end = mapped.find(VEHICLE_STATES_TAG, vehicles)
+                if vehicles_end == -1:
+                    vehicles_end = len(mapped)
+                summary.vehicles, summary.team_vehicles = _count_vehicles(mapped, vehicles, vehicles_end)
+    return summary
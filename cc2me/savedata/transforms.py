@@ -0,0 +1,126 @@
+"""Move and rotate the transforms of many vehicles at once with numpy"""
+import math
+from typing import Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+from xml.etree.ElementTree import Element
+
+from .types.spawndata import VehicleSpawn
+from .types.utils import ElementProxy, Location
+
+POSITION_ATTRIBS = ["tx", "ty", "tz"]
+# the 3x3 rotation of a transform, m<row><column>
+MATRIX_ATTRIBS = ["m00", "m01", "m02", "m10", "m11", "m12", "m20", "m21", "m22"]
+SPAWN_POSITION_ATTRIBS = ["x", "y", "z"]
+
+Offset = Union[float, Sequence[float], np.ndarray]
+
+
+def _moved(items: Sequence[ElementProxy]):
+    """Tell the saves the items belong to that they have moved"""
+    for cc2obj in {id(x.cc2obj): x.cc2obj for x in items if x.cc2obj is not None}.values():
+        cc2obj.moved([x for x in items if x.cc2obj is cc2obj])
+
+
+def vehicle_transforms(vehicle: ElementProxy) -> List[Element]:
+    """The transform of a vehicle followed by those of its bodies and attachment bodies"""
+    found = [vehicle.transform.element]
+    found.extend(vehicle.element.findall("./bodies/b/transform"))
+    found.extend(vehicle.element.findall("./attachments/a/bodies/b/transform"))
+    return found
+
+
+def collect_transforms(vehicles: Sequence[ElementProxy]) -> Tuple[List[Element], np.ndarray]:
+    """All the transforms of some vehicles, and the index of the vehicle each one belongs to"""
+    elements = []
+    owners = []
+    for row, vehicle in enumerate(vehicles):
+        found = vehicle_transforms(vehicle)
+        elements.extend(found)
+        owners.extend([row] * len(found))
+    return elements, np.array(owners, dtype=np.intp)
+
+
+def read_attribs(elements: Sequence[Element], names: Sequence[str]) -> np.ndarray:
+    """Float attribute values as a (len(elements), len(names)) array, missing attributes are 0"""
+    if not elements:
+        return np.zeros((0, len(names)))
+    return np.array([[x.attrib.get(name, "0") for name in names] for x in elements]).astype(np.float64)
+
+
+def write_attribs(elements: Sequence[Element], names: Sequence[str], values: np.ndarray):
+    """Write float attribute values, formatted the same as FloatAttribute"""
+    for element, texts in zip(elements, values.astype(str).tolist()):
+        for name, text in zip(names, texts):
+            element.attrib[name] = text
+
+
+def move_vehicles(vehicles: Sequence[ElementProxy], dx: Offset, dy: Offset = 0.0, dz: Offset = 0.0) -> int:
+    """
+    Move vehicles, their bodies and attachment bodies by an offset
+    :param vehicles:
+    :param dx: one offset for all the vehicles, or one for each
+    :param dy:
+    :param dz:
+    :return: the number of transforms changed
+    """
+    if not len(vehicles):
+        return 0
+    offsets = np.empty((len(vehicles), 3))
+    offsets[:, 0] = dx
+    offsets[:, 1] = dy
+    offsets[:, 2] = dz
+    elements, owners = collect_transforms(vehicles)
+    positions = read_attribs(elements, POSITION_ATTRIBS) + offsets[owners]
+    write_attribs(elements, POSITION_ATTRIBS, positions)
+    _moved(vehicles)
+    return len(elements)
+
+
+def yaw_matrix(yaw: float) -> np.ndarray:
+    """Rotation about the vertical (y) axis, yaw in radians"""
+    c = math.cos(yaw)
+    s = math.sin(yaw)
+    return np.array([[c, 0.0, s],
+                     [0.0, 1.0, 0.0],
+                     [-s, 0.0, c]])
+
+
+def transform_yaw(matrix: Sequence[float]) -> float:
+    """The yaw of a transform rotation given as the values of MATRIX_ATTRIBS"""
+    return math.atan2(matrix[2], matrix[0])
+
+
+def rotate_group(items: Iterable[ElementProxy], pivot: Location, yaw: float) -> int:
+    """
+    Rotate vehicles and vehicle spawns together about a vertical axis through pivot.
+    Each vehicle turns with its bodies and attachment bodies, each spawn has yaw added to its orientation.
+    :param items: Vehicle and VehicleSpawn objects
+    :param pivot: only x and z are used
+    :param yaw: radians
+    :return: the number of transforms and spawns changed
+    """
+    rotation = yaw_matrix(yaw)
+    centre = np.array([pivot.x, 0.0, pivot.z])
+    items = list(items)
+    spawns = [x for x in items if isinstance(x, VehicleSpawn)]
+    vehicles = [x for x in items if not isinstance(x, VehicleSpawn)]
+
+    elements, _ = collect_transforms(vehicles)
+    if elements:
+        positions = read_attribs(elements, POSITION_ATTRIBS)
+        write_attribs(elements, POSITION_ATTRIBS, (positions - centre) @ rotation.T + centre)
+        matrices = read_attribs(elements, MATRIX_ATTRIBS).reshape((-1, 3, 3))
+        # new transforms may not have a rotation yet
+        matrices[[MATRIX_ATTRIBS[0] not in x.attrib for x in elements]] = np.eye(3)
+        write_attribs(elements, MATRIX_ATTRIBS, (rotation @ matrices).reshape((-1, 9)))
+
+    if spawns:
+        data = [x.data for x in spawns]
+        points = [x.world_position.element for x in data]
+        positions = read_attribs(points, SPAWN_POSITION_ATTRIBS)
+        write_attribs(points, SPAWN_POSITION_ATTRIBS, (positions - centre) @ rotation.T + centre)
+        orientations = read_attribs([x.element for x in data], ["orientation"]) + yaw
+        write_attribs([x.element for x in data], ["orientation"], orientations)
+    _moved(items)
+    return len(elements) + len(spawns)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, List, Optional, Iterable, Iterator, IO
 from xml.etree.ElementTree import Element
 
 from .teams import Team
@@ -7,6 +7,7 @@ from .tiles import Tile
 from .vehicles.vehicle import Vehicle
 from .vehicles.vehicle_state import VehicleStateContainer
 from ..constants import VehicleType
+from ..instrumentation import Report, ProgressCallback
 
 
 class CC2Save(ABC):
@@ -44,11 +45,21 @@ class CC2Save(ABC):
         """Delete a tile"""
         pass
 
+    @abstractmethod
+    def remove_tiles(self, tiles: Iterable[Tile]) -> int:
+        """Delete some tiles and renumber the rest"""
+        pass
+
     @abstractmethod
     def remove_vehicle(self, vehicle: Vehicle):
         """Delete a vehicle and its state data"""
         pass
 
+    @abstractmethod
+    def remove_vehicles(self, vehicles: Iterable[Vehicle]) -> int:
+        """Delete some vehicles, their state data and their spawns"""
+        pass
+
     @property
     @abstractmethod
     def teams(self) -> List[Team]:
@@ -88,5 +99,31 @@ class CC2Save(ABC):
         pass
 
     @abstractmethod
-    def export(self) -> str:
+    def new_vehicles(self, v_type: VehicleType, count: int) -> List[Vehicle]:
+        pass
+
+    @abstractmethod
+    def reindex(self, item=None):
+        pass
+
+    @abstractmethod
+    def moved(self, items: Iterable[Any]):
+        """Tell the save that some vehicles, tiles or spawns have moved"""
+        pass
+
+    @abstractmethod
+    def touched(self, items: Iterable[Any]):
+        """Tell the save that some vehicles or vehicle states have changed (or been added or removed)"""
+        pass
+
+    @abstractmethod
+    def iter_export(self, report: Optional[Report] = None) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def export_to(self, fileobj: IO, progress: Optional[ProgressCallback] = None) -> Report:
+        pass
+
+    @abstractmethod
+    def export(self, progress: Optional[ProgressCallback] = None) -> str:
         pass
@@ -1,5 +1,6 @@
 import dataclasses
-from typing import Optional, Iterable
+from types import MappingProxyType
+from typing import Optional, Iterable, Dict, List, Mapping
 from ..constants import VehicleAttachmentDefinitionIndex
 
 
@@ -9,3 +10,36 @@ class UnitAttachment:
     position: int = 0
     choices: Optional[Iterable[VehicleAttachmentDefinitionIndex]] = None
 
+
+class AttachmentSlots:
+    """
+    The attachment points of a kind of unit, by position and by dynamic attribute name (eg "attach1" and
+    "attach1_choices"). Built once and shared by every unit of that kind, so treat it as read only.
+    """
+    __slots__ = ("by_position", "by_name", "by_choices_name", "names", "positions")
+
+    def __init__(self, attachments: Iterable[UnitAttachment] = ()):
+        self.by_position: Dict[int, UnitAttachment] = {}
+        self.by_name: Dict[str, UnitAttachment] = {}
+        self.by_choices_name: Dict[str, UnitAttachment] = {}
+        self.names: List[str] = []
+        # read only view of by_position to hand out
+        self.positions: Mapping[int, UnitAttachment] = MappingProxyType(self.by_position)
+        for attachment in attachments:
+            self.define(attachment)
+
+    def define(self, attachment: UnitAttachment):
+        """Add an attachment point, replacing any at the same position"""
+        replaced = self.by_position.get(attachment.position)
+        if replaced is not None:
+            name = f"{replaced.name}{replaced.position}"
+            del self.by_name[name]
+            del self.by_choices_name[f"{name}_choices"]
+        self.by_position[attachment.position] = attachment
+        name = f"{attachment.name}{attachment.position}"
+        self.by_name[name] = attachment
+        self.by_choices_name[f"{name}_choices"] = attachment
+        self.names = [f"{x.name}{x.position}" for x in self.by_position.values()]
+
+    def copy(self) -> "AttachmentSlots":
+        return AttachmentSlots(self.by_position.values())
@@ -1,7 +1,7 @@
 import abc
-from typing import Tuple, cast, Optional, List, Union, Dict, Iterable, Callable, Any, Protocol
+from typing import Tuple, cast, Optional, List, Union, Dict, Iterable, Callable, Any, Protocol, Mapping
 
-from .attachment_attributes import UnitAttachment
+from .attachment_attributes import UnitAttachment, AttachmentSlots
 from .spawndata import VehicleSpawn, VehicleSpawnAttachment
 from .tiles import Tile
 from .utils import ElementProxy, LocationMixin, MovableLocationMixin
@@ -13,6 +13,7 @@ from ..rules import get_unit_attachment_choices, get_unit_attachment_slots, HARD
 from ..loader import CC2XMLSave
 
 LOC_SCALE_FACTOR = 2000
+NO_ATTACHMENT_SLOTS = AttachmentSlots()
 
 
 class DynamicGetter(Protocol):
@@ -42,6 +43,8 @@ class DynamicNamedAttribute:
 
 
 class CC2MapItem:
+    __slots__ = ("object", "dynamic_attribs")
+
     def __init__(self, obj: ElementProxy):
         self.object = obj
         self.dynamic_attribs: Dict[str, DynamicNamedAttribute] = {}
@@ -96,6 +99,8 @@ class CC2MapItem:
 
 
 class Island(CC2MapItem):
+    __slots__ = ()
+
     def __init__(self, tile: Tile):
         super(Island, self).__init__(tile)
 
@@ -224,59 +229,72 @@ class Island(CC2MapItem):
 
 
 class Unit(CC2MapItem):
+    __slots__ = ("_attachment_slots",)
+    # (unit class, vehicle type) -> attachment points shared by every unit of that kind
+    _shared_slots: Dict[Tuple[type, VehicleType], AttachmentSlots] = {}
+
     def __init__(self, unit: Union[Vehicle, VehicleSpawn]):
+        # __setattr__ needs this before anything else is set
+        object.__setattr__(self, "_attachment_slots", NO_ATTACHMENT_SLOTS)
         super(Unit, self).__init__(unit)
-        self.attachments: Dict[int, UnitAttachment] = {}
-        self.setup_attachments()
+        self._attachment_slots = self.attachment_slots(self.vehicle_type)
 
-    def setup_attachments(self):
-        slots = get_unit_attachment_slots(self.vehicle_type)
-        for slot in slots:
-            self.define_attachment_point(
-                UnitAttachment(name="attach", position=slot,
-                               choices=get_unit_attachment_choices(self.vehicle_type, slot))
-            )
+    @classmethod
+    def attachment_slots(cls, v_type: VehicleType) -> AttachmentSlots:
+        """The attachment points of this class of unit for a vehicle type, built on first use"""
+        key = (cls, v_type)
+        slots = Unit._shared_slots.get(key)
+        if slots is None:
+            slots = AttachmentSlots(cls.unit_attachments(v_type))
+            Unit._shared_slots[key] = slots
+        return slots
+
+    @classmethod
+    def unit_attachments(cls, v_type: VehicleType) -> List[UnitAttachment]:
+        return [UnitAttachment(name="attach", position=slot, choices=get_unit_attachment_choices(v_type, slot))
+                for slot in get_unit_attachment_slots(v_type)]
+
+    @property
+    def attachments(self) -> Mapping[int, UnitAttachment]:
+        """The attachment points by position, shared with other units so read only"""
+        return self._attachment_slots.positions
 
     def find_attachment(self, name: str) -> Optional[UnitAttachment]:
-        for item in self.attachments.values():
-            if f"{name}" == f"{item.name}{item.position}":
-                return item
-        return None
+        return self._attachment_slots.by_name.get(name)
 
     def find_attachment_choices(self, attrib: str) -> Optional[List[VehicleAttachmentDefinitionIndex]]:
-        if attrib.endswith("_choices"):
-            name = attrib.rsplit("_", 1)[0]
-            for item in self.attachments.values():
-                if name == f"{item.name}{item.position}":
-                    return item.choices
+        item = self._attachment_slots.by_choices_name.get(attrib)
+        if item is not None:
+            return item.choices
         return None
 
     def define_attachment_point(self, attachment: UnitAttachment):
-        self.attachments[attachment.position] = attachment
+        """Add or replace an attachment point of just this unit"""
+        slots = self._attachment_slots.copy()
+        slots.define(attachment)
+        self._attachment_slots = slots
 
     def __getattr__(self, name: str):
-        if "attachments" in self.__dict__:
-            if name.endswith("_choices"):
-                choices = self.find_attachment_choices(name)
-                if choices is not None:
-                    return choices
-
-            else:
-                for item in self.attachments.values():
-                    item: UnitAttachment
-                    if name == f"{item.name}{item.position}":
-                        return self.get_attachment(item.position)
+        # only called for names that are not slots or class attributes, eg "attach1" or "attach1_choices"
+        if name.startswith("_"):
+            raise AttributeError(name)
+        slots = self._attachment_slots
+        item = slots.by_name.get(name)
+        if item is not None:
+            return self.get_attachment(item.position)
+        item = slots.by_choices_name.get(name)
+        if item is not None and item.choices is not None:
+            return item.choices
 
         if name in dir(self):
             return getattr(type(self), name).fget(self)
         raise AttributeError(name)
 
     def __setattr__(self, key: str, value):
-        if "attachments" in self.__dict__:
-            attachment = self.find_attachment(key)
-            if attachment is not None:
-                self.set_attachment(attachment.position, value)
-                return
+        item = self._attachment_slots.by_name.get(key)
+        if item is not None:
+            self.set_attachment(item.position, value)
+            return
 
         super(Unit, self).__setattr__(key, value)
 
@@ -299,11 +317,7 @@ class Unit(CC2MapItem):
 
     @property
     def dynamic_attachment_names(self) -> List[str]:
-        attachment_names = []
-        for item in self.attachments.values():
-            name = f"{item.name}{item.position}"
-            attachment_names.append(name)
-        return attachment_names
+        return list(self._attachment_slots.names)
 
     @property
     def viewable_properties(self) -> List[str]:
@@ -312,7 +326,7 @@ class Unit(CC2MapItem):
 
     @property
     def hitpoints(self) -> float:
-        return self.vehicle().state.data.hitpoints
+        return self.vehicle().state.hitpoints
 
     @hitpoints.setter
     def hitpoints(self, value: Union[float, str]):
@@ -320,9 +334,10 @@ class Unit(CC2MapItem):
             if value.isdecimal():
                 value = float(value)
         if value:
-            data = self.vehicle().state.data
+            state = self.vehicle().state
+            data = state.data
             data.hitpoints = value
-            self.vehicle().state.data = data
+            state.data = data
 
     @property
     def hitpoints_choices(self) -> List[float]:
@@ -398,54 +413,55 @@ class Unit(CC2MapItem):
 
 
 class AirUnit(Unit):
-    pass
+    __slots__ = ()
 
 
 class AirUnitAux(AirUnit):
-    pass
+    __slots__ = ()
 
 
 class Razorbill(AirUnitAux):
-    pass
+    __slots__ = ()
 
 
 class Albatross(AirUnit):
-    pass
+    __slots__ = ()
 
 
 class Petrel(Albatross):
-    pass
+    __slots__ = ()
 
 
 class Manta(Albatross, AirUnitAux):
-    pass
+    __slots__ = ()
 
 
 class GroundTurreted(Unit):
-    pass
+    __slots__ = ()
 
 
 class Turret(GroundTurreted):
-    pass
+    __slots__ = ()
 
 
 class Seal(GroundTurreted):
-    pass
+    __slots__ = ()
 
 
 class Walrus(GroundTurreted):
-    pass
+    __slots__ = ()
 
 
 class Bear(GroundTurreted):
-    pass
+    __slots__ = ()
 
 
 class Ship(Unit):
-    pass
+    __slots__ = ()
 
 
 class Carrier(Ship):
+    __slots__ = ()
 
     def __init__(self, unit: Union[Vehicle, VehicleSpawn]):
         super(Carrier, self).__init__(unit)
@@ -455,9 +471,9 @@ class Carrier(Ship):
             self.set_inventory_item
         )
 
-    def setup_attachments(self):
-        for i in range(14):
-            self.define_attachment_point(UnitAttachment(name="carrier", position=i, choices=None))
+    @classmethod
+    def unit_attachments(cls, v_type: VehicleType) -> List[UnitAttachment]:
+        return [UnitAttachment(name="carrier", position=i, choices=None) for i in range(14)]
 
     def get_inventory(self) -> Inventory:
         embedded_data = self.vehicle().state.data
@@ -476,25 +492,29 @@ class Carrier(Ship):
 
 
 class Barge(Ship):
+    __slots__ = ()
 
-    def setup_attachments(self):
-        self.define_attachment_point(
+    @classmethod
+    def unit_attachments(cls, v_type: VehicleType) -> List[UnitAttachment]:
+        return [
             UnitAttachment(name="seat",
                            position=0,
                            choices=[
                                VehicleAttachmentDefinitionIndex.DriverSeat,
-                           ]))
+                           ])
+        ]
 
 
 class Needlefish(Ship):
-    pass
+    __slots__ = ()
 
 
 class Swordfish(Needlefish):
-    pass
+    __slots__ = ()
 
 
 class Spawn(Unit):
+    __slots__ = ("tile",)
 
     def __init__(self, vspawn: VehicleSpawn, island: Tile):
         super(Spawn, self).__init__(vspawn)
@@ -567,6 +587,7 @@ class Spawn(Unit):
 
 
 class Jetty(Unit):
+    __slots__ = ()
 
     @property
     def viewable_properties(self) -> List[str]:
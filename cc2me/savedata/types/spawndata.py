@@ -8,6 +8,8 @@ from ..constants import get_spawn_attachment_type, VehicleAttachmentDefinitionIn
 
 
 class VehicleSpawnAttachment(ElementProxy):
+    __slots__ = ()
+
     tag = "a"
     ammo = e_property(IntAttribute("ammo"))
 
@@ -25,10 +27,12 @@ class VehicleSpawnAttachment(ElementProxy):
 
 
 class VehicleSpawnAttachments(ElementProxy):
+    __slots__ = ()
+
     tag = "attachments"
 
     def items(self) -> List[VehicleSpawnAttachment]:
-        return [VehicleSpawnAttachment(x) for x in self.children()]
+        return [cast(VehicleSpawnAttachment, VehicleSpawnAttachment.wrap(x, self.cc2obj)) for x in self.children()]
 
     def __getitem__(self, item_index: int) -> Optional[VehicleSpawnAttachment]:
         for item in self.items():
@@ -39,7 +43,7 @@ class VehicleSpawnAttachments(ElementProxy):
     def __delitem__(self, key):
         for child in self.element:
             if child.attrib.get("attachment_index", "-1") == str(key.attachment_index):
-                self.element.remove(child)
+                self.remove_child(child)
 
     def replace(self, attachment: VehicleSpawnAttachment):
         del self[attachment]
@@ -47,6 +51,8 @@ class VehicleSpawnAttachments(ElementProxy):
 
 
 class VehicleSpawnData(ElementProxy):
+    __slots__ = ()
+
     tag = "data"
 
     respawn_id = e_property(IntAttribute("respawn_id", default_value=0))
@@ -64,11 +70,14 @@ class VehicleSpawnData(ElementProxy):
 
 
 class VehicleSpawn(ElementProxy, MovableLocationMixin):
+    __slots__ = ()
 
     def move(self, x: float, y: float, z: float) -> None:
         self.data.world_position.x = x
         self.data.world_position.y = y
         self.data.world_position.z = z
+        if self.cc2obj is not None:
+            self.cc2obj.moved([self])
 
     @property
     def loc(self) -> Location:
@@ -86,17 +95,19 @@ class VehicleSpawn(ElementProxy, MovableLocationMixin):
     def data(self, value: VehicleSpawnData):
         children = [x for x in self.element]
         for child in children:
-            self.element.remove(child)
+            self.remove_child(child)
         self.element.append(value.element)
 
 
 class VehicleSpawnContainer(ElementProxy):
+    __slots__ = ()
+
     tag = "vehicles"
 
     def items(self) -> Iterable[VehicleSpawn]:
         ret = []
         for element in self.children():
-            ret.append(VehicleSpawn(element, self.cc2obj))
+            ret.append(VehicleSpawn.wrap(element, self.cc2obj))
         return ret
 
     def remove(self, child: VehicleSpawn):
@@ -104,13 +115,15 @@ class VehicleSpawnContainer(ElementProxy):
         for item in children:
             item: VehicleSpawn
             if item.data.respawn_id == child.data.respawn_id:
-                self.element.remove(item.element)
+                self.remove_child(item.element)
 
     def append(self, item: VehicleSpawn):
         self.element.append(item.element)
 
 
 class SpawnData(ElementProxy, IsSetMixin):
+    __slots__ = ()
+
     tag = "spawn_data"
     team_id = e_property(IntAttribute("team_id", default_value=0))
 
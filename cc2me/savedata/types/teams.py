@@ -2,6 +2,8 @@ from .utils import ElementProxy, e_property, IntAttribute, BoolAttribute
 
 
 class Team(ElementProxy):
+    __slots__ = ()
+
     id = e_property(IntAttribute("id"))
     pattern_index = e_property(IntAttribute("pattern_index", default_value=5))
     is_ai_controlled = e_property(BoolAttribute("is_ai_controlled", default_value=False))
@@ -13,6 +13,8 @@ from ..constants import MAX_INTEGER, generate_island_seed
 
 
 class Facility(ElementProxy):
+    __slots__ = ()
+
     tag = "facility"
 
     category = e_property(IntAttribute("category", default_value=1))
@@ -26,6 +28,8 @@ class Facility(ElementProxy):
 
 
 class Tile(ElementProxy, MovableLocationMixin):
+    __slots__ = ()
+
     tag = "t"
 
     id = e_property(IntAttribute("id", default_value=0))
@@ -77,6 +81,8 @@ class Tile(ElementProxy, MovableLocationMixin):
             self.bounds.min.z = -1 * radius
             self.bounds.max.x = radius
             self.bounds.max.z = radius
+            if self.cc2obj is not None:
+                self.cc2obj.moved([self])
 
     @property
     def spawn_data(self) -> SpawnData:
@@ -110,10 +116,13 @@ class Tile(ElementProxy, MovableLocationMixin):
             self.world_position.z = z
 
         # update the spawn locations
-        for item in self.spawn_data.vehicles.items():
+        spawns = self.spawn_data.vehicles.items()
+        for item in spawns:
             item.data.world_position.x += dx
             item.data.world_position.y += dy
             item.data.world_position.z += dz
+        if self.cc2obj is not None:
+            self.cc2obj.moved([self] + list(spawns))
 
     def move(self, x: float, y: float, z: float) -> None:
         self.set_position(x=x, y=y, z=z)
@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Any, List, cast
+from typing import Optional, Any, List, Dict, Type, Tuple, cast
 from xml.etree.ElementTree import Element
 
 
 class ElementAttributeProxy(ABC):
-
+    """
+    Convert an element attribute to and from a python value.
+    The parsed value is kept by each proxy and only parsed again if the attribute text changes.
+    """
     type_default: Optional[Any] = None
 
     def __init__(self,
@@ -23,15 +26,43 @@ class ElementAttributeProxy(ABC):
             return self.base_default_value
         return self.type_default
 
-    def get(self) -> Any:
-        if self.parent is None:
-            return self.default_value
-        return self.parent.get(self.name, default_value=str(self.default_value))
+    @abstractmethod
+    def parse(self, text: str) -> Any:
+        pass
 
     @abstractmethod
-    def set(self, value: Any):
+    def format(self, value: Any) -> str:
         pass
 
+    def read(self, owner: Optional["ElementProxy"]) -> Any:
+        if owner is None:
+            return self.default_value
+        text = owner.element.attrib.get(self.name)
+        values = owner.attribute_values
+        if values is None:
+            values = owner.attribute_values = {}
+        cached = values.get(self.name)
+        # attribute values are only replaced, never changed, so the same text object means the same value
+        if cached is not None and cached[0] is text:
+            return cached[1]
+        value = self.parse(str(self.default_value) if text is None else text)
+        values[self.name] = (text, value)
+        return value
+
+    def write(self, owner: "ElementProxy", value: Any):
+        # written straight away, other code (indexes, exports) reads the element attributes directly
+        text = self.format(value)
+        owner.element.attrib[self.name] = text
+        if owner.attribute_values is None:
+            owner.attribute_values = {}
+        owner.attribute_values[self.name] = (text, self.parse(text))
+
+    def get(self) -> Any:
+        return self.read(self.parent)
+
+    def set(self, value: Any):
+        self.write(self.parent, value)
+
 
 class e_property(property):
     def __init__(self, attribute: ElementAttributeProxy, side_effect: Optional[callable] = None):
@@ -44,15 +75,12 @@ class e_property(property):
         self.side_effect: callable = side_effect
 
     # x = property(getx, setx, delx, "I'm the 'x' property.")
+    # the attribute is shared by every instance, so the owner is passed along rather than stored on it
     def do_get(self, owner: "ElementProxy"):
-        if owner is not None:
-            self.attribute.parent = owner
-        return self.attribute.get()
+        return self.attribute.read(owner)
 
     def do_set(self, owner, value):
-        if owner is not None:
-            self.attribute.parent = owner
-        self.attribute.set(value)
+        self.attribute.write(owner, value)
         if self.side_effect is not None:
             self.side_effect(owner)
 
@@ -61,54 +89,94 @@ class BoolAttribute(ElementAttributeProxy):
 
     type_default = False
 
-    def get(self) -> Any:
-        value = super(BoolAttribute, self).get()
-        return value == "true"
+    def parse(self, text: str) -> Any:
+        return text == "true"
 
-    def set(self, value: Any):
-        value = str(value).lower()
-        if value == "true":
-            self.parent.set(self.name, "true")
-        else:
-            self.parent.set(self.name, "false")
+    def format(self, value: Any) -> str:
+        if str(value).lower() == "true":
+            return "true"
+        return "false"
 
 
 class StrAttribute(ElementAttributeProxy):
 
     type_default = ""
 
-    def get(self) -> Any:
-        return str(super(StrAttribute, self).get())
+    def parse(self, text: str) -> Any:
+        return str(text)
 
-    def set(self, value: Any):
-        self.parent.set(self.name, str(value))
+    def format(self, value: Any) -> str:
+        return str(value)
 
 
 class IntAttribute(ElementAttributeProxy):
 
     type_default = 0
 
-    def get(self) -> Any:
-        return int(super(IntAttribute, self).get())
+    def parse(self, text: str) -> Any:
+        return int(text)
 
-    def set(self, value: Any):
-        self.parent.set(self.name, str(int(value)))
+    def format(self, value: Any) -> str:
+        return str(int(value))
 
 
 class FloatAttribute(ElementAttributeProxy):
 
     type_default = 0.0
 
-    def set(self, value: Any):
-        self.parent.set(self.name, str(float(value)))
+    def parse(self, text: str) -> Any:
+        return float(text)
 
-    def get(self) -> Any:
-        return float(super(FloatAttribute, self).get())
+    def format(self, value: Any) -> str:
+        return str(float(value))
+
+
+class ProxyCache:
+    """
+    The proxy objects made for the elements of a save, so that the same element always gets the same proxy.
+    Proxies hold on to their elements, so the save drops them when it removes an element.
+    """
+    def __init__(self):
+        self._proxies: Dict[Element, Dict[type, "ElementProxy"]] = {}
+
+    def __len__(self):
+        return len(self._proxies)
+
+    def get(self, proxy: Type["ElementProxy"], element: Element, cc2obj: Any) -> "ElementProxy":
+        found = self._proxies.get(element)
+        if found is None:
+            found = self._proxies[element] = {}
+        item = found.get(proxy)
+        if item is None:
+            item = found[proxy] = proxy(element, cc2obj=cc2obj)
+        return item
+
+    def add(self, item: "ElementProxy"):
+        """Remember a proxy made for a new element"""
+        self._proxies.setdefault(item.element, {})[type(item)] = item
+
+    def drop(self, element: Element):
+        """Forget the proxies of an element and everything inside it"""
+        for item in element.iter():
+            self._proxies.pop(item, None)
+
+    def clear(self):
+        self._proxies.clear()
 
 
 class ElementProxy(ABC):
+    __slots__ = ("element", "cc2obj", "attribute_values")
+
     tag: str = "X"
 
+    @classmethod
+    def wrap(cls, element: Element, cc2obj: Optional[Any] = None) -> "ElementProxy":
+        """Get a proxy for an existing element, the same one each time if cc2obj has a proxy cache"""
+        cache: Optional[ProxyCache] = getattr(cc2obj, "proxies", None)
+        if cache is None:
+            return cls(element, cc2obj=cc2obj)
+        return cache.get(cls, element, cc2obj)
+
     def __init__(self, element: Optional[Element] = None, cc2obj: Optional[Any] = None):
         apply_defaults = False
         if element is None:
@@ -116,6 +184,8 @@ class ElementProxy(ABC):
             apply_defaults = True
         self.element = element
         self.cc2obj: "CC2Save" = cc2obj
+        # attribute name -> (text, value) of each e_property read, made on first use, see ElementAttributeProxy
+        self.attribute_values: Optional[Dict[str, Tuple[Optional[str], Any]]] = None
         if apply_defaults:
             self.defaults()
 
@@ -135,10 +205,17 @@ class ElementProxy(ABC):
     def children(self) -> List[Element]:
         return [x for x in self.element]
 
+    def remove_child(self, child: Element):
+        """Remove a child element and forget any proxies for it"""
+        self.element.remove(child)
+        cache: Optional[ProxyCache] = getattr(self.cc2obj, "proxies", None)
+        if cache is not None:
+            cache.drop(child)
+
     def get_default_child_by_tag(self, proxy: callable) -> Element:
         for item in self.children():
             if item.tag == proxy.tag:
-                return proxy(item, cc2obj=self.cc2obj)
+                return proxy.wrap(item, self.cc2obj)
         try:
             added = proxy()
             self.element.append(added.element)
@@ -148,12 +225,16 @@ class ElementProxy(ABC):
 
 
 class Point3D(ElementProxy):
+    __slots__ = ()
+
     x = e_property(FloatAttribute("x"))
     y = e_property(FloatAttribute("y"))
     z = e_property(FloatAttribute("z"))
 
 
 class Min(Point3D):
+    __slots__ = ()
+
     tag = "min"
 
     def defaults(self):
@@ -163,6 +244,8 @@ class Min(Point3D):
 
 
 class Max(Point3D):
+    __slots__ = ()
+
     tag = "max"
 
     def defaults(self):
@@ -179,6 +262,8 @@ class Location:
 
 
 class LocationMixin(ABC):
+    __slots__ = ()
+
     @property
     @abstractmethod
     def loc(self) -> Location:
@@ -186,16 +271,22 @@ class LocationMixin(ABC):
 
 
 class MovableLocationMixin(LocationMixin, ABC):
+    __slots__ = ()
+
     @abstractmethod
     def move(self, x: float, y: float, z: float) -> None:
         pass
 
 
 class WorldPosition(Point3D):
+    __slots__ = ()
+
     tag = "world_position"
 
 
 class Bounds(ElementProxy):
+    __slots__ = ()
+
     tag = "bounds"
 
     def defaults(self):
@@ -215,6 +306,8 @@ class Bounds(ElementProxy):
 
 
 class IsSetMixin:
+    __slots__ = ()
+
     is_set = e_property(BoolAttribute("is_set", default_value=False))
 
 
@@ -223,6 +316,8 @@ class Transform(ElementProxy):
     Movement and rotation of an object/body
     <transform m00="9.99983729e-01" m01="5.36093389e-03" m02="1.95000893e-03" m10="-5.40422454e-03" m11="9.99722757e-01" m12="2.29173339e-02" m20="-1.82660999e-03" m21="-2.29274993e-02" m22="9.99735462e-01" tx="8.82208525e+03" ty="-2.19774270e+00" tz="5.10294861e+03"/>
     """
+    __slots__ = ()
+
     tag = "transform"
 
     # I have no idea what these do, perhaps it is 3d a rotation matrix?
@@ -243,21 +338,29 @@ class Transform(ElementProxy):
 
 
 class LinearVelocity(Point3D):
+    __slots__ = ()
+
     tag = "linear_velocity"
 
 
 class AngularVelocity(Point3D):
+    __slots__ = ()
+
     tag = "angular_velocity"
 
 
 class Bodies(ElementProxy):
+    __slots__ = ()
+
     tag = "bodies"
 
     def items(self) -> List["Body"]:
-        return [Body(x) for x in self.children()]
+        return [cast(Body, Body.wrap(x, self.cc2obj)) for x in self.children()]
 
 
 class Body(ElementProxy):
+    __slots__ = ()
+
     tag = "b"
 
     @property
@@ -5,6 +5,8 @@ from ..utils import ElementProxy, e_property, IntAttribute, Bodies
 
 
 class Attachment(ElementProxy):
+    __slots__ = ()
+
     tag = "a"
     attachment_index = e_property(IntAttribute("attachment_index"))
     definition_index = e_property(IntAttribute("definition_index"))
@@ -15,10 +17,12 @@ class Attachment(ElementProxy):
 
 
 class Attachments(ElementProxy):
+    __slots__ = ()
+
     tag = "attachments"
 
     def items(self) -> List[Attachment]:
-        return [Attachment(x) for x in self.children()]
+        return [cast(Attachment, Attachment.wrap(x, self.cc2obj)) for x in self.children()]
 
     def __getitem__(self, item_index: int) -> Optional[Attachment]:
         for item in self.items():
@@ -29,7 +33,7 @@ class Attachments(ElementProxy):
     def __delitem__(self, key):
         for child in self.element:
             if child.attrib.get("attachment_index", "-1") == str(key.attachment_index):
-                self.element.remove(child)
+                self.remove_child(child)
 
     def replace(self, attachment: Attachment):
         del self[attachment]
@@ -4,6 +4,8 @@ from ...utils import ElementProxy, IntAttribute, e_property, FloatAttribute, Boo
 
 
 class EmbeddedData(ElementProxy):
+    __slots__ = ()
+
     tag = "data"
 
     def to_string(self):
@@ -13,11 +15,15 @@ class EmbeddedData(ElementProxy):
 
 
 class Quantity(ElementProxy):
+    __slots__ = ()
+
     tag = "q"
     value = e_property(IntAttribute("value"))
 
 
 class QuantitiyList(ElementProxy):
+    __slots__ = ()
+
     tag = "item_quantities"
 
     def items(self) -> List[int]:
@@ -25,6 +31,8 @@ class QuantitiyList(ElementProxy):
 
 
 class Inventory(ElementProxy):
+    __slots__ = ()
+
     tag = "inventory"
     total_weight = e_property(IntAttribute("total_weight"))
 
@@ -34,6 +42,8 @@ class Inventory(ElementProxy):
 
 
 class EmbeddedVehicleStateData(EmbeddedData):
+    __slots__ = ()
+
     # see cc2me/tests/canned_saves/manta-state.xml
     # and cc2me/tests/canned_saves/carrier-state.xml
     tag = "data"
@@ -52,6 +62,8 @@ class EmbeddedVehicleStateData(EmbeddedData):
 
 
 class EmbeddedAttachmentStateData(EmbeddedData):
+    __slots__ = ()
+
     ammo = e_property(IntAttribute("ammo"))
     fuel_capacity = e_property(FloatAttribute("fuel_capacity"))
     fuel_remaining = e_property(FloatAttribute("fuel_remaining"))
@@ -7,6 +7,7 @@ from ..teams import Team
 from ..utils import (ElementProxy, e_property, IntAttribute, Transform, Bodies,
                      Location, MovableLocationMixin)
 from ...constants import VehicleType, VehicleAttachmentDefinitionIndex, get_attachment_capacity
+from ...transforms import move_vehicles
 
 REMOTE_DRIVEABLE_VEHICLES = [
     VehicleType.Bear,
@@ -23,6 +24,8 @@ REMOTE_DRIVEABLE_VEHICLES = [
 
 
 class Vehicle(ElementProxy, MovableLocationMixin):
+    __slots__ = ()
+
     tag = "v"
 
     @property
@@ -48,7 +51,13 @@ class Vehicle(ElementProxy, MovableLocationMixin):
             return self.type in REMOTE_DRIVEABLE_VEHICLES
         return False
 
+    def reindex(self):
+        # the save indexes vehicles by definition and team
+        if self.cc2obj is not None:
+            self.cc2obj.reindex(self)
+
     def on_set_team_id(self):
+        self.reindex()
         # if we are set to a human team, ensure there is a pilot seat for some unit types
         if self.human_remote_pilot:
             a0 = self.attachments[0]
@@ -57,7 +66,7 @@ class Vehicle(ElementProxy, MovableLocationMixin):
                 # make a driver seat
 
     id = e_property(IntAttribute("id"))
-    definition_index = e_property(IntAttribute("definition_index"))
+    definition_index = e_property(IntAttribute("definition_index"), side_effect=reindex)
     team_id = e_property(IntAttribute("team_id"), side_effect=on_set_team_id)
 
     @property
@@ -86,26 +95,7 @@ class Vehicle(ElementProxy, MovableLocationMixin):
         if z is None:
             z = current_position.tz
 
-        dx = x - current_position.tx
-        dy = y - current_position.ty
-        dz = z - current_position.tz
-
-        # update positions
-        self.transform.tx += dx
-        self.transform.ty += dy
-        self.transform.tz += dz
-
-        for att in self.attachments.items():
-            if att.bodies:
-                for body in att.bodies.items():
-                    body.transform.tx += dx
-                    body.transform.ty += dy
-                    body.transform.tz += dz
-
-        for body in self.bodies.items():
-            body.transform.tx += dx
-            body.transform.ty += dy
-            body.transform.tz += dz
+        move_vehicles([self], x - current_position.tx, y - current_position.ty, z - current_position.tz)
 
     def move(self, x: float, y: float, z: float) -> None:
         self.set_location(x, y, z)
@@ -149,9 +139,10 @@ class Vehicle(ElementProxy, MovableLocationMixin):
                 data = new_attachment_state.data
                 for attrib_name in capacity.attribs:
                     setattr(data, attrib_name, capacity.count)
-
                 new_attachment_state.data = data
                 self.state.attachments.replace(new_attachment_state)
         else:
             del self.attachments[attachment_index]
             del self.state.attachments[attachment_index]
+        if self.cc2obj is not None:
+            self.cc2obj.touched([self])
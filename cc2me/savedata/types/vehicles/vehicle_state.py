@@ -1,38 +1,214 @@
-from typing import cast, List, Optional
+import re
+import weakref
+from typing import cast, Any, Dict, List, Optional, Tuple, Type
+from xml.sax.saxutils import unescape
 
 from xml.etree import ElementTree
-from .embedded_xmlstates.vehicles import EmbeddedVehicleStateData, EmbeddedAttachmentStateData
+from xml.etree.ElementTree import Element
+from .embedded_xmlstates.vehicles import EmbeddedData, EmbeddedVehicleStateData, EmbeddedAttachmentStateData
 from ..utils import ElementProxy, e_property, StrAttribute, IntAttribute
+from ...splice import content_fingerprint
 
+# the start tag of the root element of an embedded document, skipping the xml declaration
+STATE_ROOT = re.compile(r"<(?![?!])[\w:-]+((?:[^\"'>]|\"[^\"]*\"|'[^']*')*)>")
+STATE_ATTRIBUTE = re.compile(r"([\w:-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)')")
+ENTITIES = {"&quot;": "\"", "&apos;": "'"}
 
-class VehicleAttachmentState(ElementProxy):
-    tag = "a"
-    attachment_index = e_property(IntAttribute("attachment_index"))
-    state = e_property(StrAttribute("state"))
 
-    def defaults(self):
-        data = self.data
+def scan_state_root(text: Optional[str]) -> Dict[str, str]:
+    """Read the attributes of the root element of an embedded state document without parsing the rest"""
+    found = {}
+    match = STATE_ROOT.search(text) if text else None
+    if match is not None:
+        for name, double, single in STATE_ATTRIBUTE.findall(match.group(1)):
+            value = double or single
+            if "&" in value:
+                value = unescape(value, ENTITIES)
+            found[name] = value
+    return found
+
+
+class _ParsedState:
+    __slots__ = ("text", "data", "fingerprint", "dirty")
+
+    def __init__(self, text: Optional[str], data: EmbeddedData, dirty: bool):
+        self.text = text
         self.data = data
+        self.fingerprint = None if dirty else content_fingerprint(data.element)
+        self.dirty = dirty
 
-    @property
-    def data(self) -> EmbeddedAttachmentStateData:
-        root = None
+
+class EmbeddedStateCache:
+    """
+    The parsed state documents of a save, keyed by the element holding them in its state attribute.
+
+    Each document is parsed once and the same tree is returned until something else writes the
+    state attribute. Changed trees are only serialised back into their attributes by flush(), which
+    the save calls before export. A tree counts as changed if it was marked dirty or if its content
+    differs from when it was parsed, so direct edits of a cached tree are not lost.
+    """
+    def __init__(self):
+        self._entries: "weakref.WeakKeyDictionary[Element, _ParsedState]" = weakref.WeakKeyDictionary()
+        # root attributes read by peek() from documents that have not been parsed, with the text they came from
+        self._scanned: "weakref.WeakKeyDictionary[Element, Tuple[str, Dict[str, str]]]" = \
+            weakref.WeakKeyDictionary()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, element: Element, data_type: Type[EmbeddedData]) -> EmbeddedData:
+        text = element.attrib.get("state")
+        entry = self._entries.get(element)
+        if entry is None or entry.text is not text:
+            entry = _ParsedState(text, parse_state(text, data_type), dirty=False)
+            self._entries[element] = entry
+        return entry.data
+
+    def peek(self, element: Element, data_type: Type[EmbeddedData], name: str) -> Any:
+        """
+        Read one attribute of the root of a document. A parsed tree is used if there is one (it may have
+        changes not yet written), otherwise only the root start tag is scanned.
+        """
+        text = element.attrib.get("state")
+        entry = self._entries.get(element)
+        if entry is not None and entry.text is text:
+            return getattr(entry.data, name)
+        scanned = self._scanned.get(element)
+        if scanned is None or scanned[0] is not text:
+            scanned = (text, scan_state_root(text))
+            self._scanned[element] = scanned
+        if not scanned[1]:
+            # no usable root, parsing gives the default document
+            return getattr(self.get(element, data_type), name)
+        return peek_value(data_type, name, scanned[1])
+
+    def set(self, element: Element, data: EmbeddedData):
+        self._entries[element] = _ParsedState(element.attrib.get("state"), data, dirty=True)
+
+    def mark_dirty(self, element: Element):
+        entry = self._entries.get(element)
+        if entry is not None:
+            entry.dirty = True
+
+    def flush(self, element: Optional[Element] = None) -> int:
+        """Write changed trees (or just the one for element) into their state attributes, return how many"""
+        if element is not None:
+            entry = self._entries.get(element)
+            items = [] if entry is None else [(element, entry)]
+        else:
+            items = list(self._entries.items())
+        written = 0
+        for element, entry in items:
+            if entry.dirty or content_fingerprint(entry.data.element) != entry.fingerprint:
+                text = entry.data.to_string()
+                element.attrib["state"] = text
+                entry.text = text
+                entry.fingerprint = content_fingerprint(entry.data.element)
+                entry.dirty = False
+                written += 1
+        return written
+
+
+def parse_state(text: Optional[str], data_type: Type[EmbeddedData]) -> EmbeddedData:
+    root = None
+    if text:
         try:
-            root = ElementTree.fromstring(self.state)
+            root = ElementTree.fromstring(text)
         except ElementTree.ParseError:
             pass
-        return EmbeddedAttachmentStateData(element=root)
+    return data_type(element=root)
+
+
+def peek_value(data_type: Type[EmbeddedData], name: str, attribs: Dict[str, str]) -> Any:
+    """Convert a scanned root attribute the same way the e_property of data_type does"""
+    attribute = getattr(data_type, name).attribute
+    text = attribs.get(name)
+    return attribute.parse(str(attribute.default_value) if text is None else text)
+
+
+class EmbeddedStateHolder(ElementProxy):
+    """
+    An element with an embedded xml document in its state attribute.
+    If the save has an EmbeddedStateCache the document is parsed once and written back at export,
+    otherwise it is parsed on every read and serialised on every write.
+    """
+    __slots__ = ()
+
+    data_type: Type[EmbeddedData] = EmbeddedData
+    state = e_property(StrAttribute("state", default_value=""))
+
+    def defaults(self):
+        data = self.get_data()
+        self.set_data(data)
+
+    @property
+    def state_cache(self) -> Optional[EmbeddedStateCache]:
+        return getattr(self.cc2obj, "embedded_states", None)
+
+    def get_data(self) -> EmbeddedData:
+        cache = self.state_cache
+        if cache is None:
+            return parse_state(self.element.attrib.get("state"), self.data_type)
+        return cache.get(self.element, self.data_type)
+
+    def set_data(self, value: EmbeddedData):
+        cache = self.state_cache
+        if cache is None:
+            self.state = value.to_string()
+        else:
+            cache.set(self.element, value)
+        if self.cc2obj is not None:
+            self.cc2obj.touched([self])
+
+    def peek(self, name: str) -> Any:
+        """Read an attribute of the root of the document, for read only uses that do not need the whole tree"""
+        cache = self.state_cache
+        if cache is None:
+            attribs = scan_state_root(self.element.attrib.get("state"))
+            if not attribs:
+                return getattr(self.get_data(), name)
+            return peek_value(self.data_type, name, attribs)
+        return cache.peek(self.element, self.data_type, name)
+
+    def mark_dirty(self):
+        """Tell the save the cached document was changed, without a cache use set_data() instead"""
+        cache = self.state_cache
+        if cache is None:
+            raise ValueError("no state cache to hold the changed document, write it back with set_data()")
+        cache.mark_dirty(self.element)
+        if self.cc2obj is not None:
+            self.cc2obj.touched([self])
+
+    def flush(self):
+        """Write any pending change to the document into the state attribute now"""
+        cache = self.state_cache
+        if cache is not None:
+            cache.flush(self.element)
+
+
+class VehicleAttachmentState(EmbeddedStateHolder):
+    __slots__ = ()
+
+    tag = "a"
+    data_type = EmbeddedAttachmentStateData
+    attachment_index = e_property(IntAttribute("attachment_index"))
+
+    @property
+    def data(self) -> EmbeddedAttachmentStateData:
+        return cast(EmbeddedAttachmentStateData, self.get_data())
 
     @data.setter
     def data(self, value: EmbeddedAttachmentStateData):
-        self.state = value.to_string()
+        self.set_data(value)
 
 
 class VehicleAttachmentStates(ElementProxy):
+    __slots__ = ()
+
     tag = "attachments"
 
     def items(self) -> List[VehicleAttachmentState]:
-        return [VehicleAttachmentState(x) for x in self.children()]
+        return [cast(VehicleAttachmentState, VehicleAttachmentState.wrap(x, self.cc2obj)) for x in self.children()]
 
     def __getitem__(self, attachment_index) -> Optional[VehicleAttachmentState]:
         for item in self.items():
@@ -46,21 +222,35 @@ class VehicleAttachmentStates(ElementProxy):
             children = [x for x in self.element]
             for child in children:
                 if child.attrib.get("attachment_index", "-1") == a_id:
-                    self.element.remove(child)
+                    self.remove_child(child)
 
     def replace(self, attachment: VehicleAttachmentState):
         del self[attachment]
         self.element.append(attachment.element)
 
 
-class VehicleStateContainer(ElementProxy):
+class VehicleStateContainer(EmbeddedStateHolder):
+    __slots__ = ()
+
     tag = "v"
+    data_type = EmbeddedVehicleStateData
     id = e_property(IntAttribute("id", default_value=0))
-    state = e_property(StrAttribute("state", default_value=""))
 
-    def defaults(self):
-        data = self.data
-        self.data = data
+    @property
+    def hitpoints(self) -> int:
+        return self.peek("hitpoints")
+
+    @property
+    def is_destroyed(self) -> bool:
+        return self.peek("is_destroyed")
+
+    @property
+    def attached_to_vehicle_id(self) -> int:
+        return self.peek("attached_to_vehicle_id")
+
+    @property
+    def internal_fuel_remaining(self) -> float:
+        return self.peek("internal_fuel_remaining")
 
     @property
     def attachments(self) -> VehicleAttachmentStates:
@@ -68,14 +258,8 @@ class VehicleStateContainer(ElementProxy):
 
     @property
     def data(self) -> EmbeddedVehicleStateData:
-        root = None
-        try:
-            root = ElementTree.fromstring(self.state)
-        except ElementTree.ParseError:
-            pass
-        return EmbeddedVehicleStateData(element=root)
+        return cast(EmbeddedVehicleStateData, self.get_data())
 
     @data.setter
     def data(self, value: EmbeddedVehicleStateData):
-        self.state = value.to_string()
-
+        self.set_data(value)
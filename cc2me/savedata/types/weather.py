@@ -0,0 +1,157 @@
+from typing import Optional, cast
+
+import numpy as np
+
+from .utils import ElementProxy, e_property, IntAttribute
+from ..rawspans import is_raw_token
+
+# the first 4 bytes of each grid are the little endian size of the unpacked grid
+GRID_HEADER_SIZE = 4
+GRID_CELL_SIZE = 4
+
+
+def decode_grid_hex(text: str) -> np.ndarray:
+    """Decode grid hex data, the game writes each byte low nibble first"""
+    packed = np.frombuffer(bytes.fromhex(text), dtype=np.uint8)
+    return (packed >> 4) | (packed << 4)
+
+
+def encode_grid_hex(values: np.ndarray) -> str:
+    packed = (values >> 4) | (values << 4)
+    return packed.astype(np.uint8).tobytes().hex().upper()
+
+
+class WeatherGrid(ElementProxy):
+    """
+    A weather grid, the data is decoded on first use and only encoded again if it was modified
+    <velocity size_x="256" size_y="256" data="00008000871041C9..."/>
+    """
+    __slots__ = ("_data", "modified")
+
+    size_x = e_property(IntAttribute("size_x", default_value=256))
+    size_y = e_property(IntAttribute("size_y", default_value=256))
+
+    def __init__(self, element=None, cc2obj=None):
+        super(WeatherGrid, self).__init__(element=element, cc2obj=cc2obj)
+        self._data: Optional[np.ndarray] = None
+        self.modified = False
+
+    def _get_hex(self) -> str:
+        value = self.get("data", "")
+        if is_raw_token(value) and self.cc2obj is not None:
+            return self.cc2obj.raw_spans.get(value).decode("ascii")
+        return value
+
+    def _set_hex(self, text: str):
+        value = self.get("data", "")
+        if is_raw_token(value) and self.cc2obj is not None:
+            self.cc2obj.raw_spans.set(value, text.encode("ascii"))
+        else:
+            self.set("data", text)
+
+    @property
+    def data(self) -> np.ndarray:
+        """All the bytes of the grid (read only), use modify() to change them"""
+        if self._data is None:
+            self._data = decode_grid_hex(self._get_hex())
+            self._data.flags.writeable = False
+        return self._data
+
+    @data.setter
+    def data(self, value: np.ndarray):
+        self._data = np.array(value, dtype=np.uint8)
+        self._data.flags.writeable = False
+        self.modified = True
+
+    def modify(self) -> np.ndarray:
+        """Get a writable copy of the grid bytes that will be saved on export"""
+        data = self.data.copy()
+        self._data = data
+        self.modified = True
+        return data
+
+    @property
+    def unpacked_size(self) -> int:
+        """Size in bytes of the unpacked grid, from the grid header"""
+        return int(self.data[:GRID_HEADER_SIZE].view("<u4")[0])
+
+    @property
+    def channels(self) -> int:
+        """Number of float values per grid cell"""
+        return self.unpacked_size // (self.size_x * self.size_y * GRID_CELL_SIZE)
+
+    @property
+    def is_packed(self) -> bool:
+        return len(self.data) - GRID_HEADER_SIZE != self.unpacked_size
+
+    @property
+    def grid(self) -> np.ndarray:
+        """The grid as a (size_y, size_x, channels) float array, only possible if the data is not packed"""
+        if self.is_packed:
+            raise ValueError(f"{self.element.tag} grid data is packed")
+        values = self.data[GRID_HEADER_SIZE:].view("<f4")
+        return values.reshape((self.size_y, self.size_x, self.channels))
+
+    @grid.setter
+    def grid(self, value: np.ndarray):
+        values = np.ascontiguousarray(value, dtype="<f4")
+        header = np.array([values.nbytes], dtype="<u4").view(np.uint8)
+        self.data = np.concatenate([header, values.reshape(-1).view(np.uint8)])
+
+    def flush(self):
+        """Write the grid back to the element if it was modified"""
+        if self.modified:
+            self._set_hex(encode_grid_hex(self.data))
+            self.modified = False
+
+
+class VelocityGrid(WeatherGrid):
+    __slots__ = ()
+
+    tag = "velocity"
+
+
+class PressureGrid(WeatherGrid):
+    __slots__ = ()
+
+    tag = "pressure"
+
+
+class PropertiesGrid(WeatherGrid):
+    __slots__ = ()
+
+    tag = "properties"
+
+
+class Weather(ElementProxy):
+    __slots__ = ("_grids",)
+
+    tag = "weather"
+    rng_state = e_property(IntAttribute("rng_state"))
+
+    def __init__(self, element=None, cc2obj=None):
+        super(Weather, self).__init__(element=element, cc2obj=cc2obj)
+        self._grids = {}
+
+    def _grid(self, proxy: callable) -> WeatherGrid:
+        # keep the grid proxies so modified data is still there at export
+        if proxy.tag not in self._grids:
+            self._grids[proxy.tag] = self.get_default_child_by_tag(proxy)
+            self._grids[proxy.tag].cc2obj = self.cc2obj
+        return self._grids[proxy.tag]
+
+    @property
+    def velocity(self) -> VelocityGrid:
+        return cast(VelocityGrid, self._grid(VelocityGrid))
+
+    @property
+    def pressure(self) -> PressureGrid:
+        return cast(PressureGrid, self._grid(PressureGrid))
+
+    @property
+    def properties(self) -> PropertiesGrid:
+        return cast(PropertiesGrid, self._grid(PropertiesGrid))
+
+    def flush(self):
+        for grid in self._grids.values():
+            grid.flush()
@@ -0,0 +1,279 @@
+"""
+Check a save against the editor's rules: attachments per slot, ammunition against capacity, id counters
+and vehicle states without vehicles.
+
+    validator = cc2.validator
+    validator.run(incremental=False)   # check everything
+    ...edit...
+    validator.run()                    # only check the vehicles touched since the last run
+"""
+import dataclasses
+import weakref
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from xml.etree.ElementTree import Element
+
+from .constants import AmmunitionCapacity, VehicleAttachmentDefinitionIndex, VehicleType, get_attachment_capacity
+from .rules import UNIT_ATTACHMENT_OPTIONS
+from .types.abstract import CC2Save
+from .types.utils import ElementProxy
+from .types.vehicles.vehicle import Vehicle
+from .types.vehicles.vehicle_state import VehicleStateContainer
+
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+
+UNKNOWN_VEHICLE_TYPE = "unknown-vehicle-type"
+UNKNOWN_ATTACHMENT = "unknown-attachment"
+NO_SUCH_SLOT = "no-such-slot"
+ATTACHMENT_NOT_ALLOWED = "attachment-not-allowed"
+AMMO_OVER_CAPACITY = "ammo-over-capacity"
+MISSING_STATE = "missing-state"
+ORPHAN_STATE = "orphan-state"
+DUPLICATE_VEHICLE_ID = "duplicate-vehicle-id"
+VEHICLE_ID_COUNTER = "vehicle-id-counter"
+TILE_ID_COUNTER = "tile-id-counter"
+
+
+@dataclasses.dataclass(frozen=True)
+class Diagnostic:
+    """One problem found in a save"""
+    severity: str
+    code: str
+    message: str
+    vehicle_id: Optional[int] = None
+    attachment_index: Optional[int] = None
+
+    def __str__(self):
+        return f"{self.severity}: {self.message}"
+
+
+def _int(element: Element, name: str) -> int:
+    try:
+        return int(element.attrib.get(name, 0))
+    except ValueError:
+        return 0
+
+
+def check_ids(cc2: CC2Save) -> List[Diagnostic]:
+    """Check the id counters, duplicate vehicle ids and states without vehicles"""
+    found = []
+    vehicle_ids = [_int(x, "id") for x in cc2.vehicles_parent if x.tag == Vehicle.tag]
+    seen = set()
+    for v_id in vehicle_ids:
+        if v_id in seen:
+            found.append(Diagnostic(SEVERITY_ERROR, DUPLICATE_VEHICLE_ID, f"vehicle id {v_id} is used more than once",
+                                    vehicle_id=v_id))
+        seen.add(v_id)
+
+    counter = _int(cc2.scene_vehicles, "id_counter")
+    if vehicle_ids and counter < max(vehicle_ids):
+        found.append(Diagnostic(SEVERITY_ERROR, VEHICLE_ID_COUNTER,
+                                f"vehicle id_counter {counter} is below the highest vehicle id {max(vehicle_ids)}"))
+    tile_ids = [x.id for x in cc2.tiles]
+    counter = _int(cc2.tiles_parent, "id_counter")
+    if tile_ids and counter < max(tile_ids):
+        found.append(Diagnostic(SEVERITY_ERROR, TILE_ID_COUNTER,
+                                f"tile id_counter {counter} is below the highest tile id {max(tile_ids)}"))
+
+    for state in cc2.vehicle_states_parent:
+        if state.tag != VehicleStateContainer.tag:
+            continue
+        s_id = _int(state, "id")
+        if s_id not in seen:
+            found.append(Diagnostic(SEVERITY_WARNING, ORPHAN_STATE, f"vehicle state {s_id} has no vehicle",
+                                    vehicle_id=s_id))
+    return found
+
+
+def check_vehicle(vehicle: Vehicle, owners: Optional[Dict[Element, Element]] = None) -> List[Diagnostic]:
+    """
+    Check the attachments of a vehicle against its slots and their ammunition against capacity
+    :param vehicle:
+    :param owners: if given, filled with attachment state element -> vehicle element
+    :return:
+    """
+    v_id = vehicle.id
+    try:
+        v_type = VehicleType.lookup(vehicle.definition_index)
+    except KeyError:
+        return [Diagnostic(SEVERITY_ERROR, UNKNOWN_VEHICLE_TYPE,
+                           f"vehicle {v_id} has unknown definition_index {vehicle.definition_index}", vehicle_id=v_id)]
+
+    found = []
+    state = vehicle.state
+    attachment_states = {}
+    if state is None:
+        found.append(Diagnostic(SEVERITY_ERROR, MISSING_STATE, f"{v_type.name} {v_id} has no vehicle state",
+                                vehicle_id=v_id))
+    else:
+        for item in state.attachments.items():
+            attachment_states[item.attachment_index] = item
+            if owners is not None:
+                owners[item.element] = vehicle.element
+
+    slots = UNIT_ATTACHMENT_OPTIONS.get(v_type)
+    for item in vehicle.attachments.items():
+        slot = item.attachment_index
+        try:
+            attachment = VehicleAttachmentDefinitionIndex.lookup(item.definition_index)
+        except KeyError:
+            found.append(Diagnostic(SEVERITY_WARNING, UNKNOWN_ATTACHMENT,
+                                    f"{v_type.name} {v_id} slot {slot} has unknown attachment {item.definition_index}",
+                                    vehicle_id=v_id, attachment_index=slot))
+            continue
+        if slots is not None:
+            if not 0 <= slot < len(slots):
+                found.append(Diagnostic(SEVERITY_WARNING, NO_SUCH_SLOT,
+                                        f"{v_type.name} {v_id} has {attachment.name} in slot {slot}, "
+                                        f"it has {len(slots)} slots",
+                                        vehicle_id=v_id, attachment_index=slot))
+            elif attachment not in slots[slot]:
+                found.append(Diagnostic(SEVERITY_WARNING, ATTACHMENT_NOT_ALLOWED,
+                                        f"{v_type.name} {v_id} cannot carry {attachment.name} in slot {slot}",
+                                        vehicle_id=v_id, attachment_index=slot))
+
+        capacity = get_attachment_capacity(v_type, attachment)
+        attachment_state = attachment_states.get(slot)
+        if isinstance(capacity, AmmunitionCapacity) and attachment_state is not None:
+            ammo = attachment_state.peek("ammo")
+            if ammo > capacity.count:
+                found.append(Diagnostic(SEVERITY_WARNING, AMMO_OVER_CAPACITY,
+                                        f"{v_type.name} {v_id} {attachment.name} in slot {slot} has {ammo} ammo, "
+                                        f"capacity is {capacity.count}",
+                                        vehicle_id=v_id, attachment_index=slot))
+    return found
+
+
+def validate_save(cc2: CC2Save) -> List[Diagnostic]:
+    """Check a whole save once"""
+    return Validator(cc2).run(incremental=False)
+
+
+class Validator:
+    """
+    Keep the diagnostics of a save up to date.
+
+    The results of each vehicle are kept between runs, an incremental run only checks the vehicles
+    touched since the last one (see CC2Save.touched, the save also touches the vehicles it creates and
+    removes). The id and orphan state checks run again when the vehicle or state containers change size,
+    an id counter changes or a touched vehicle has a new id. If the vehicle container does not have the
+    size the touched vehicles account for the run checks everything. Other edits made directly on the
+    element tree are not noticed, touch() the vehicles or run with incremental=False after making them.
+    """
+    def __init__(self, cc2: CC2Save):
+        self.cc2 = cc2
+        # vehicle element -> (id when checked, diagnostics), in save order
+        self._results: Dict[Element, Tuple[int, List[Diagnostic]]] = {}
+        self._global: List[Diagnostic] = []
+        self._diagnostics: List[Diagnostic] = []
+        self._touched: Dict[Element, Vehicle] = {}
+        self._touched_ids: Set[int] = set()
+        # attachment state element -> vehicle element, from the last check of each vehicle
+        self._owners: "weakref.WeakKeyDictionary[Element, Element]" = weakref.WeakKeyDictionary()
+        # the vehicle container and its number of children that are not vehicles, at the last run
+        self._parent: Optional[Element] = None
+        self._others = 0
+        self._shape: Optional[tuple] = None
+        self._full = True
+        self.checked = 0
+
+    def reset(self):
+        """Check everything on the next run"""
+        self._full = True
+
+    def touch(self, items: Iterable[ElementProxy]):
+        """Record that some vehicles, vehicle states or attachment states have changed (or been added or removed)"""
+        for item in items:
+            if isinstance(item, Vehicle):
+                self._touched[item.element] = item
+            elif isinstance(item, VehicleStateContainer):
+                self._touched_ids.add(item.id)
+            else:
+                owner = self._results.get(self._owners.get(item.element))
+                if owner is None:
+                    # a new attachment state, the vehicle setting it touches itself
+                    continue
+                self._touched_ids.add(owner[0])
+
+    def _shape_of(self) -> tuple:
+        # what the id checks depend on besides the vehicle ids
+        cc2 = self.cc2
+        return (len(cc2.vehicle_states_parent), cc2.scene_vehicles.attrib.get("id_counter"),
+                cc2.tiles_parent.attrib.get("id_counter"))
+
+    def _check(self, vehicle: Vehicle) -> Tuple[int, List[Diagnostic]]:
+        self.checked += 1
+        return vehicle.id, check_vehicle(vehicle, self._owners)
+
+    def _run_all(self):
+        cc2 = self.cc2
+        self._results = {x.element: self._check(x) for x in cc2.vehicles}
+        self._parent = cc2.vehicles_parent
+        self._others = len(self._parent) - len(self._results)
+
+    def _run_touched(self) -> bool:
+        """Check the touched vehicles, True if any was added, removed or has a new id"""
+        cc2 = self.cc2
+        touched = dict(self._touched)
+        for v_id in self._touched_ids:
+            try:
+                vehicle = cc2.vehicle(v_id)
+            except KeyError:
+                continue
+            touched[vehicle.element] = vehicle
+        ids_changed = False
+        for element, vehicle in touched.items():
+            try:
+                current = cc2.vehicle(vehicle.id).element is element
+            except KeyError:
+                current = False
+            old = self._results.get(element)
+            if not current:
+                # removed, or its id is no longer unique
+                if old is not None:
+                    del self._results[element]
+                    ids_changed = True
+                continue
+            result = self._results[element] = self._check(vehicle)
+            ids_changed = ids_changed or old is None or old[0] != result[0]
+        return ids_changed
+
+    def _accounted(self) -> bool:
+        parent = self.cc2.vehicles_parent
+        return parent is self._parent and len(parent) - len(self._results) == self._others
+
+    def run(self, incremental: bool = True) -> List[Diagnostic]:
+        """
+        Check the save
+        :param incremental: only check the vehicles touched since the last run
+        :return: all the diagnostics, including those kept from earlier runs
+        """
+        self.checked = 0
+        full = self._full or not incremental
+        changed = full or bool(self._touched or self._touched_ids)
+        ids_changed = False
+        if not full:
+            ids_changed = self._run_touched()
+            full = not self._accounted()
+        if full:
+            self.checked = 0
+            self._run_all()
+        self._touched.clear()
+        self._touched_ids.clear()
+        self._full = False
+
+        shape = self._shape_of()
+        if full or ids_changed or shape != self._shape:
+            self._global = check_ids(self.cc2)
+            self._shape = shape
+            changed = True
+        if changed:
+            self._diagnostics = list(self._global)
+            for _, found in self._results.values():
+                self._diagnostics.extend(found)
+        return self.diagnostics
+
+    @property
+    def diagnostics(self) -> List[Diagnostic]:
+        """The diagnostics of the last run"""
+        return list(self._diagnostics)
@@ -0,0 +1,150 @@
+"""
+Columns of values for every vehicle of a save as numpy arrays, for queries and bulk edits.
+
+    table = cc2.vehicle_table()
+    weak = (table.team_id == 2) & (table.hitpoints < 500)
+    table.hitpoints[weak] = 500
+    table.write_back()
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .transforms import move_vehicles, write_attribs
+from .types.abstract import CC2Save
+from .types.vehicles.vehicle import Vehicle
+from .types.vehicles.vehicle_state import VehicleStateContainer
+
+POSITION_COLUMNS = ["tx", "ty", "tz"]
+STATE_COLUMNS = {
+    # column -> root attribute of the embedded state
+    "hitpoints": "hitpoints",
+    "fuel": "internal_fuel_remaining",
+    "is_destroyed": "is_destroyed",
+}
+# changing these would break the link between a vehicle and its state
+READ_ONLY_COLUMNS = ["id", "has_state"]
+# vehicle attributes the save keeps indexes of
+INDEXED_COLUMNS = ["definition_index", "team_id"]
+
+COLUMN_TYPES = {
+    "id": np.int64,
+    "definition_index": np.int64,
+    "team_id": np.int64,
+    "tx": np.float64,
+    "ty": np.float64,
+    "tz": np.float64,
+    "hitpoints": np.int64,
+    "fuel": np.float64,
+    "is_destroyed": np.bool_,
+    "has_state": np.bool_,
+}
+
+
+class VehicleTable:
+    """
+    A snapshot of the vehicles of a save, one numpy array per column and one row per vehicle.
+
+    The arrays can be changed in place, write_back() finds the rows that differ from the snapshot
+    and applies just those changes to the save. Moving a vehicle moves its bodies too. The state
+    columns (hitpoints, fuel, is_destroyed) are zero for vehicles without a state (has_state is False)
+    and cannot be changed for them. Take a new table after adding or removing vehicles.
+    """
+    def __init__(self, cc2: CC2Save):
+        self.cc2 = cc2
+        self.vehicles: List[Vehicle] = cc2.vehicles
+        self.states: List[Optional[VehicleStateContainer]] = [cc2.vehicle_state(x.id) for x in self.vehicles]
+        self.columns: Dict[str, np.ndarray] = {}
+        self._original: Dict[str, np.ndarray] = {}
+        self.read()
+
+    def __len__(self) -> int:
+        return len(self.vehicles)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def read(self):
+        """Read every column from the save, discarding changes not written back"""
+        values = {name: [] for name in COLUMN_TYPES}
+        for vehicle, state in zip(self.vehicles, self.states):
+            attrib = vehicle.element.attrib
+            values["id"].append(int(attrib.get("id", 0)))
+            values["definition_index"].append(int(attrib.get("definition_index", 0)))
+            values["team_id"].append(int(attrib.get("team_id", 0)))
+            transform = vehicle.element.find("transform")
+            for name in POSITION_COLUMNS:
+                values[name].append(float(transform.attrib.get(name, 0)) if transform is not None else 0.0)
+            values["has_state"].append(state is not None)
+            for column, name in STATE_COLUMNS.items():
+                values[column].append(state.peek(name) if state is not None else 0)
+
+        self.columns = {name: np.array(value, dtype=COLUMN_TYPES[name]) for name, value in values.items()}
+        self._original = {name: value.copy() for name, value in self.columns.items()}
+
+    def changed_rows(self, *names: str) -> np.ndarray:
+        """Indexes of the rows where any of the named columns differ from the snapshot"""
+        changed = np.zeros(len(self), dtype=np.bool_)
+        for name in names:
+            changed |= self.columns[name] != self._original[name]
+        return np.flatnonzero(changed)
+
+    def select(self, mask: np.ndarray) -> List[Vehicle]:
+        """The vehicles of the rows selected by a boolean mask or array of row indexes"""
+        return [self.vehicles[x] for x in np.arange(len(self))[mask]]
+
+    def distance_to(self, x: float, z: float) -> np.ndarray:
+        """Horizontal distance of each vehicle from a point"""
+        return np.hypot(self.columns["tx"] - x, self.columns["tz"] - z)
+
+    def write_back(self) -> int:
+        """
+        Apply the changed rows to the save
+        :return: the number of vehicles changed
+        """
+        for name in READ_ONLY_COLUMNS:
+            if len(self.changed_rows(name)):
+                raise ValueError(f"column {name} cannot be changed")
+        state_rows = self.changed_rows(*STATE_COLUMNS)
+        if not self.columns["has_state"][state_rows].all():
+            raise ValueError("cannot set state columns of vehicles without a state")
+
+        c = self.columns
+        touched = set(state_rows.tolist())
+        for name in INDEXED_COLUMNS:
+            rows = self.changed_rows(name)
+            if len(rows):
+                vehicles = [self.vehicles[x] for x in rows]
+                write_attribs([x.element for x in vehicles], [name], c[name][rows].reshape((-1, 1)))
+                for vehicle in vehicles:
+                    # the save indexes vehicles by these
+                    vehicle.reindex()
+                touched.update(rows.tolist())
+
+        rows = self.changed_rows(*POSITION_COLUMNS)
+        if len(rows):
+            offsets = [c[name][rows] - self._original[name][rows] for name in POSITION_COLUMNS]
+            move_vehicles([self.vehicles[x] for x in rows], *offsets)
+            touched.update(rows.tolist())
+
+        changed = {column: c[column] != self._original[column] for column in STATE_COLUMNS}
+        for row in state_rows:
+            state = self.states[row]
+            data = state.data
+            for column, name in STATE_COLUMNS.items():
+                if changed[column][row]:
+                    setattr(data, name, c[column][row].item())
+            if state.state_cache is None:
+                state.data = data
+            else:
+                # the save's state cache holds the edited document until export
+                state.mark_dirty()
+
+        self._original = {name: value.copy() for name, value in self.columns.items()}
+        return len(touched)
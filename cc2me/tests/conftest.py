@@ -0,0 +1,12 @@
+import pytest
+
+from ..savedata import cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the default snapshot cache of each test out of the user's cache dir"""
+    path = tmp_path / "cc2me-cache"
+    monkeypatch.setenv("CC2ME_CACHE_DIR", str(path))
+    monkeypatch.setattr(cache, "_default_cache", None)
+    return path
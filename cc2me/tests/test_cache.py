@@ -0,0 +1,66 @@
+from pathlib import Path
+import os
+import shutil
+
+from ..savedata.cache import SnapshotCache
+from ..savedata.loader import load_save_file, ENGINE_MMAP, ROOT_ORDER
+from .test_load_save import assert_same_element
+
+HERE = Path(__file__).parent
+SAVE = HERE / "canned_saves" / "save.xml"
+
+
+def test_snapshot_cache(tmp_path):
+    filename = str(tmp_path / "save.xml")
+    shutil.copy(SAVE, filename)
+    cache = SnapshotCache(tmp_path / "cache")
+
+    parsed = load_save_file(filename, cache=cache)
+    assert len(cache.entries()) == 1
+    key = cache.file_key(filename)
+    assert cache.get(filename, "parsed", key) is not None
+
+    cached = load_save_file(filename, cache=cache)
+    for root in ROOT_ORDER:
+        assert_same_element(parsed.roots[root].getroot(), cached.roots[root].getroot())
+    # each load gets its own tree
+    assert cached.roots[ROOT_ORDER[1]].getroot() is not parsed.roots[ROOT_ORDER[1]].getroot()
+
+    # raw spans are a separate entry
+    raw = load_save_file(filename, engine=ENGINE_MMAP, raw_spans=True, cache=cache)
+    assert len(cache.entries()) == 2
+    raw_cached = load_save_file(filename, engine=ENGINE_MMAP, raw_spans=True, cache=cache)
+    assert raw_cached.export() == raw.export()
+
+    # changing the file invalidates the entry
+    cached.tile(1).seed = 1234
+    with open(filename, "w") as fd:
+        cached.export_to(fd)
+    assert cache.get(filename, "parsed", cache.file_key(filename)) is None
+    assert load_save_file(filename, cache=cache).tile(1).seed == 1234
+
+
+def test_snapshot_cache_eviction(tmp_path):
+    cache = SnapshotCache(tmp_path / "cache", max_size=1)
+    filename = str(tmp_path / "save.xml")
+    shutil.copy(SAVE, filename)
+    load_save_file(filename, cache=cache)
+    assert cache.entries() == []
+
+    cache.max_size = os.stat(filename).st_size * 3
+    for i in range(4):
+        copy = str(tmp_path / f"save{i}.xml")
+        shutil.copy(SAVE, copy)
+        load_save_file(copy, cache=cache)
+    assert len(cache.entries()) == 2
+    # the most recently used survive
+    assert cache.entry_path(str(tmp_path / "save3.xml"), "parsed").exists()
+
+
+def test_default_cache(tmp_path, cache_dir):
+    filename = str(tmp_path / "save.xml")
+    shutil.copy(SAVE, filename)
+    load_save_file(filename)
+    assert not cache_dir.exists()
+    load_save_file(filename, cache=True)
+    assert len(SnapshotCache(cache_dir / "snapshots").entries()) == 1
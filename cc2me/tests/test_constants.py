@@ -0,0 +1,45 @@
+import pytest
+
+from ..savedata.constants import (VehicleType, VehicleAttachmentDefinitionIndex, IslandTypes, ATTACHMENT_CAPACITY,
+                                  VEHICLE_DEFAULT_STATE, CAPACITY_DUPLICATES, get_attachment_capacity,
+                                  get_default_state, get_default_hitpoints, _default_capacity)
+
+
+def test_enum_lookups():
+    assert VehicleType.lookup(VehicleType.Seal.value) is VehicleType.Seal
+    assert IslandTypes.reverse_lookup("Fuel") is IslandTypes.Fuel
+    assert VehicleType.get_name(VehicleType.Bear.value) == "Bear"
+    assert VehicleType.get_name(9999) == "Unknown 9999"
+    with pytest.raises(KeyError):
+        VehicleType.lookup(9999)
+    with pytest.raises(KeyError):
+        IslandTypes.reverse_lookup("Nothing")
+
+
+def test_capacity_table_matches_rules():
+    for vehicle in VehicleType:
+        for attachment in VehicleAttachmentDefinitionIndex:
+            expected = next((x for x in ATTACHMENT_CAPACITY if x.attachment == attachment and vehicle in x.vtypes),
+                            None)
+            found = get_attachment_capacity(vehicle.value, attachment.value)
+            if expected is not None:
+                assert found is expected
+            else:
+                default = _default_capacity(vehicle, attachment)
+                assert (found is None) == (default is None)
+                if found is not None:
+                    assert (type(found), found.count) == (type(default), default.count)
+
+        assert get_default_state(vehicle) == [x for x in VEHICLE_DEFAULT_STATE if vehicle in x.vtypes]
+    assert get_default_hitpoints(VehicleType.Carrier) == 5000
+
+
+def test_capacity_duplicates():
+    conflicts = {(x.vehicle, x.attachment, x.kept.count, x.ignored.count) for x in CAPACITY_DUPLICATES if x.conflicting}
+    assert conflicts == {
+        (VehicleType.Swordfish, VehicleAttachmentDefinitionIndex.Flares, 60, 50),
+        (VehicleType.Needlefish, VehicleAttachmentDefinitionIndex.Flares, 60, 50),
+    }
+    repeated = {(x.vehicle, x.attachment) for x in CAPACITY_DUPLICATES if not x.conflicting}
+    assert (VehicleType.Bear, VehicleAttachmentDefinitionIndex.SmokeBomb) in repeated
+    assert (VehicleType.Carrier, VehicleAttachmentDefinitionIndex.Gun100mm) in repeated
@@ -0,0 +1,158 @@
+from pathlib import Path
+from xml.etree.ElementTree import Element
+
+import pytest
+
+from ..savedata.constants import VehicleType
+from ..savedata.loader import load_save_file
+
+HERE = Path(__file__).parent
+
+
+def load():
+    return load_save_file(str(HERE / "canned_saves" / "save.xml"))
+
+
+def test_lookups_match_scan():
+    cc2 = load()
+    for vehicle in cc2.vehicles:
+        assert cc2.vehicle(vehicle.id).element is vehicle.element
+        assert cc2.vehicle_state(vehicle.id).id == vehicle.id
+    for tile in cc2.tiles:
+        assert cc2.tile(tile.id).element is tile.element
+    for team in cc2.teams:
+        assert cc2.team(team.id).element is team.element
+    seals = cc2.find_vehicles_by_definition(VehicleType.Seal.value)
+    assert seals
+    assert [x.element for x in seals] == [x.element for x in cc2.vehicles if x.type == VehicleType.Seal]
+    with pytest.raises(KeyError):
+        cc2.vehicle(99999)
+
+
+def test_indexes_follow_edits():
+    cc2 = load()
+    walrus = cc2.new_vehicle(VehicleType.Walrus)
+    assert cc2.vehicle(walrus.id).element is walrus.element
+    assert cc2.vehicle_state(walrus.id) is not None
+    assert walrus.element in [x.element for x in cc2.find_vehicles_by_definition(VehicleType.Walrus.value)]
+
+    walrus.team_id = 2
+    assert walrus.element in [x.element for x in cc2.find_vehicles_by_team(2)]
+    walrus.definition_index = VehicleType.Bear.value
+    assert walrus.element in [x.element for x in cc2.find_vehicles_by_definition(VehicleType.Bear.value)]
+
+    cc2.remove_vehicle(walrus)
+    with pytest.raises(KeyError):
+        cc2.vehicle(walrus.id)
+    assert cc2.vehicle_state(walrus.id) is None
+
+    # edits made directly to the tree
+    cc2.vehicles_parent.append(Element("v", id="5000", definition_index="2", team_id="1"))
+    assert cc2.vehicle(5000).definition_index == 2
+    first = cc2.vehicles[0]
+    old_id = first.id
+    first.element.attrib["id"] = "5001"
+    # looking up the old id notices the change
+    with pytest.raises(KeyError):
+        cc2.vehicle(old_id)
+    assert cc2.vehicle(5001).element is first.element
+
+    tile = cc2.new_tile()
+    assert cc2.tile(tile.id).element is tile.element
+    first = cc2.tiles[0]
+    cc2.remove_tile(first)
+    assert len(cc2.tiles) == 4
+    for tile in cc2.tiles:
+        assert cc2.tile(tile.id).element is tile.element
+
+
+def test_index_miss_is_cheap(monkeypatch):
+    cc2 = load()
+    index = cc2._vehicle_index
+    assert cc2.find_vehicles_by_team(1)
+    by_key = index.by_key
+    rebuilds = []
+    monkeypatch.setattr(index, "rebuild", lambda *args: rebuilds.append(args))
+    for v_id in range(90000, 90100):
+        assert cc2.vehicle_state(v_id) is None
+        assert index.get(v_id) is None
+    assert not rebuilds
+    assert index.by_key is by_key
+    assert "team_id" in index.secondary
+
+
+def test_proxy_identity():
+    cc2 = load()
+    vehicles = cc2.vehicles
+    assert all(a is b for a, b in zip(vehicles, cc2.vehicles))
+    assert cc2.vehicle(vehicles[0].id) is vehicles[0]
+    assert vehicles[0].transform is vehicles[0].transform
+    assert cc2.tiles[0] is cc2.tile(cc2.tiles[0].id)
+    assert cc2.teams[0] is cc2.team(cc2.teams[0].id)
+
+    for vehicle in cc2.vehicles:
+        assert vehicle.state is cc2.vehicle_state(vehicle.id)
+    cached = len(cc2.proxies)
+    for vehicle in cc2.vehicles:
+        assert vehicle.state is not None
+    assert len(cc2.proxies) == cached
+
+    walrus = cc2.new_vehicle(VehicleType.Walrus)
+    assert cc2.vehicle(walrus.id) is walrus
+    cc2.remove_vehicle(walrus)
+    assert len(cc2.proxies) == cached
+
+
+def test_id_allocation():
+    cc2 = load()
+    highest = max(x.id for x in cc2.vehicles)
+    counter = int(cc2.scene_vehicles.attrib["id_counter"])
+    walrus = cc2.new_vehicle(VehicleType.Walrus)
+    assert walrus.id == max(highest, counter) + 1
+
+    created = cc2.new_vehicles(VehicleType.Seal, 50)
+    assert [x.id for x in created] == list(range(walrus.id + 1, walrus.id + 51))
+    assert cc2.scene_vehicles.attrib["id_counter"] == str(created[-1].id)
+    assert all(cc2.vehicle_state(x.id) is not None for x in created)
+    assert len({x.id for x in cc2.vehicles}) == len(cc2.vehicles)
+    assert cc2.new_vehicles(VehicleType.Seal, 0) == []
+
+    respawn = cc2.next_respawn_id
+    assert respawn == 1 + max(x.data.respawn_id for t in cc2.tiles for x in t.spawn_data.vehicles.items())
+    assert cc2.new_respawn_id() == respawn
+    assert cc2.next_respawn_id == respawn + 1
+
+
+def test_batch_removal():
+    cc2 = load()
+    tiles = cc2.tiles
+    keep = [tiles[0], tiles[2]]
+    kept_seeds = [x.seed for x in keep]
+    assert cc2.remove_tiles([tiles[1], tiles[3]]) == 2
+    assert [x.seed for x in cc2.tiles] == kept_seeds
+    assert [(x.id, x.index) for x in cc2.tiles] == [(1, 0), (2, 1)]
+    assert cc2.tile(2).element is keep[1].element
+    assert cc2.tiles_parent.attrib["id_counter"] == "2"
+    assert cc2.remove_tiles([]) == 0
+
+    spawns = [x for t in cc2.tiles for x in t.spawn_data.vehicles.items()]
+    assert spawns
+    # make the first spawn one for a vehicle we remove
+    vehicles = cc2.vehicles[:20]
+    spawns[0].data.respawn_id = vehicles[0].id
+    spawn_ids = [x.data.respawn_id for x in spawns]
+    count = len(cc2.vehicles)
+    seal_count = len(cc2.find_vehicles_by_definition(VehicleType.Seal.value))
+    seals = [x for x in vehicles if x.type == VehicleType.Seal]
+
+    assert cc2.remove_vehicles(vehicles) == 20
+    assert len(cc2.vehicles) == count - 20
+    assert len(cc2.vehicle_states) == len(cc2.vehicles)
+    assert len(cc2.find_vehicles_by_definition(VehicleType.Seal.value)) == seal_count - len(seals)
+    for vehicle in vehicles:
+        with pytest.raises(KeyError):
+            cc2.vehicle(vehicle.id)
+        assert cc2.vehicle_state(vehicle.id) is None
+    remaining = [x.data.respawn_id for t in cc2.tiles for x in t.spawn_data.vehicles.items()]
+    assert remaining == spawn_ids[1:]
+    assert cc2.remove_spawns(remaining[:2]) == 2
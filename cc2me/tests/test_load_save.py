@@ -1,8 +1,16 @@
 from pathlib import Path
+import gzip
+import io
+import os
 import random
 
+import pytest
+
 from ..savedata.constants import BIOME_DARK_MESAS, VehicleType, VehicleAttachmentDefinitionIndex
-from ..savedata.loader import load_save_file
+from ..savedata.profiling import measure_load, measure_proxies
+from ..savedata.loader import load_save_file, ENGINE_SEEK, ENGINE_SINGLE_PASS, ENGINE_MMAP, \
+    ROOT_ORDER, SCENE_ROOT, LOADER_ENGINES
+from ..savedata.rawspans import is_raw_token
 
 HERE = Path(__file__).parent
 
@@ -64,3 +72,106 @@ def test_add_attachments():
     saved = saved.replace("> ", ">\n")
     with open("save.xml", "w") as fd:
         fd.write(saved)
+
+
+def assert_same_element(left, right):
+    assert left.tag == right.tag
+    assert left.attrib == right.attrib
+    assert len(left) == len(right)
+    for left_child, right_child in zip(left, right):
+        assert_same_element(left_child, right_child)
+
+
+def test_loader_engines_match():
+    filename = str(HERE / "canned_saves" / "save.xml")
+    seek = load_save_file(filename, engine=ENGINE_SEEK)
+    single = load_save_file(filename, engine=ENGINE_SINGLE_PASS)
+
+    for root in ROOT_ORDER:
+        if seek.roots[root].getroot() is not None:
+            assert_same_element(seek.roots[root].getroot(), single.roots[root].getroot())
+        # the seek loader can miss the last root, the single pass loader should not
+        assert single.roots[root].getroot() is not None
+
+    assert len(single.tiles) == 4
+    assert len(single.vehicles) == len(seek.vehicles)
+
+
+def test_loader_unknown_engine():
+    with pytest.raises(ValueError):
+        load_save_file(str(HERE / "canned_saves" / "save.xml"), engine="nope")
+
+
+def test_mmap_engine_matches_single_pass():
+    filename = str(HERE / "canned_saves" / "save.xml")
+    single = load_save_file(filename, engine=ENGINE_SINGLE_PASS)
+    mapped = load_save_file(filename, engine=ENGINE_MMAP)
+    for root in ROOT_ORDER:
+        assert_same_element(single.roots[root].getroot(), mapped.roots[root].getroot())
+
+
+def test_measure_load():
+    result = measure_load(str(HERE / "canned_saves" / "save.xml"), ENGINE_MMAP)
+    assert result.engine == ENGINE_MMAP
+    assert result.seconds > 0
+    assert result.peak_traced > 0
+
+
+def test_measure_proxies():
+    results = measure_proxies(str(HERE / "canned_saves" / "save.xml"), count=100)
+    assert {x.name for x in results} >= {"Vehicle", "Transform", "Unit"}
+    assert all(x.bytes_each > 0 and x.construct_ns > 0 for x in results)
+
+
+def test_raw_span_export_matches():
+    filename = str(HERE / "canned_saves" / "save.xml")
+    parsed = load_save_file(filename, engine=ENGINE_MMAP)
+    raw = load_save_file(filename, engine=ENGINE_MMAP, raw_spans=True)
+
+    assert len(raw.raw_spans) == 3
+    weather = raw.roots[SCENE_ROOT].getroot().find("./weather")
+    for grid in weather.findall("./velocity") + weather.findall("./pressure") + weather.findall("./properties"):
+        assert is_raw_token(grid.attrib["data"])
+        assert raw.raw_spans.get(grid.attrib["data"]).startswith(b"0000")
+
+    assert raw.export() == parsed.export()
+
+
+def test_raw_span_needs_mmap():
+    with pytest.raises(ValueError):
+        load_save_file(str(HERE / "canned_saves" / "save.xml"), engine=ENGINE_SEEK, raw_spans=True)
+
+
+def test_export_to_file_objects():
+    cc2 = load_save_file(str(HERE / "canned_saves" / "save.xml"))
+    expected = cc2.export()
+
+    chunks = list(cc2.iter_export())
+    assert len(chunks) > 1
+    assert "".join(chunks) == expected
+
+    compressed = io.BytesIO()
+    with gzip.GzipFile(fileobj=compressed, mode="wb") as fd:
+        report = cc2.export_to(fd)
+    assert report.counters["chars"] == len(expected)
+    assert gzip.decompress(compressed.getvalue()).decode("utf-8") == expected
+
+
+@pytest.mark.parametrize("engine", LOADER_ENGINES)
+def test_load_report(engine):
+    filename = str(HERE / "canned_saves" / "save.xml")
+    calls = []
+    cc2 = load_save_file(filename, engine=engine, progress=lambda *args: calls.append(args))
+    report = cc2.load_report
+    assert report.counters["bytes"] == os.path.getsize(filename)
+    assert report.counters["elements"] > len(cc2.tiles)
+    assert report.seconds >= sum(report.phases.values())
+    assert any(x == "parse" or x.startswith("parse:") for x in report.phases)
+    assert calls
+    assert all(phase == "parse" and done <= total for phase, done, total in calls)
+
+    calls.clear()
+    exported = cc2.export(progress=lambda *args: calls.append(args))
+    assert cc2.export_report.counters["chars"] == len(exported)
+    assert set(cc2.export_report.phases) == {"export", "write"}
+    assert calls[-1] == ("export", 4, 4)
@@ -0,0 +1,53 @@
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from ..savedata.loader import load_save_file, ENGINE_MMAP, ENGINE_PARALLEL, ENGINE_SINGLE_PASS, ROOT_ORDER
+from ..savedata.parallel import find_root_spans, parse_roots
+from .test_load_save import assert_same_element
+
+HERE = Path(__file__).parent
+SAVE = HERE / "canned_saves" / "save.xml"
+
+
+def test_find_root_spans():
+    data = b'<?xml version="1.0"?>\n<meta v="1"/>\n<scene a=">"><vehicles/><scene_x></scene_x></scene>\n' \
+           b'<vehicles><vehicles><v/></vehicles><vehicles_x></vehicles_x></vehicles >\n<missiles/>'
+    spans = find_root_spans(data, ROOT_ORDER)
+    assert data[slice(*spans["meta"])] == b'<meta v="1"/>'
+    assert data[slice(*spans["scene"])] == b'<scene a=">"><vehicles/><scene_x></scene_x></scene>'
+    assert data[slice(*spans["vehicles"])] == \
+        b'<vehicles><vehicles><v/></vehicles><vehicles_x></vehicles_x></vehicles >'
+    assert data[slice(*spans["missiles"])] == b'<missiles/>'
+
+
+def test_parse_roots_parallel():
+    data = SAVE.read_bytes()
+    expected = load_save_file(str(SAVE), engine=ENGINE_SINGLE_PASS)
+    for parallel in [False, True]:
+        found = parse_roots(data, ROOT_ORDER, parallel=parallel)
+        for root in ROOT_ORDER:
+            assert_same_element(expected.roots[root].getroot(), found[root])
+
+    cc2 = load_save_file(str(SAVE), engine=ENGINE_PARALLEL)
+    assert len(cc2.tiles) == 4
+
+
+def test_truncated_save(tmp_path):
+    data = SAVE.read_bytes()
+    filename = tmp_path / "truncated.xml"
+    filename.write_bytes(data[:len(data) // 2])
+    with pytest.raises(ElementTree.ParseError):
+        load_save_file(str(filename), engine=ENGINE_PARALLEL)
+    with pytest.raises(ElementTree.ParseError):
+        find_root_spans(data[:data.index(b"</vehicles>")], ROOT_ORDER)
+
+
+def test_export_matches_other_engines():
+    single = load_save_file(str(SAVE), engine=ENGINE_SINGLE_PASS)
+    expected = single.export()
+    assert load_save_file(str(SAVE), engine=ENGINE_MMAP).export() == expected
+    assert load_save_file(str(SAVE), engine=ENGINE_PARALLEL).export() == expected
+    found = parse_roots(SAVE.read_bytes(), ROOT_ORDER, parallel=True)
+    assert [found[root].tail for root in ROOT_ORDER] == [single.roots[root].getroot().tail for root in ROOT_ORDER]
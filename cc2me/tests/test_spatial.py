@@ -0,0 +1,81 @@
+import random
+from pathlib import Path
+
+from ..savedata.constants import VehicleType
+from ..savedata.loader import load_save_file
+from ..savedata.spatial import SpatialGrid, box_distance, vehicle_box, tile_box, spawn_box
+from ..savedata.transforms import move_vehicles
+from ..savedata.types.spawndata import VehicleSpawn
+from ..savedata.types.tiles import Tile
+from ..savedata.types.vehicles.vehicle import Vehicle
+
+HERE = Path(__file__).parent
+
+
+def load():
+    return load_save_file(str(HERE / "canned_saves" / "save.xml"))
+
+
+def test_grid_matches_scan():
+    random.seed(2)
+    grid = SpatialGrid(cell_size=100)
+    boxes = {}
+    for key in range(300):
+        x, z = random.uniform(-2000, 2000), random.uniform(-2000, 2000)
+        size = random.choice([0, 0, 50, 400])
+        boxes[key] = (x, z, x + size, z + size)
+        grid.insert(key, boxes[key], kind=key % 2)
+    for key in range(0, 300, 3):
+        grid.remove(key)
+        del boxes[key]
+    assert len(grid) == len(boxes)
+
+    for _ in range(20):
+        x, z = random.uniform(-2500, 2500), random.uniform(-2500, 2500)
+        radius = random.uniform(0, 800)
+        expected = {k for k, b in boxes.items() if box_distance(b, x, z) <= radius}
+        assert set(grid.query_radius(x, z, radius)) == expected
+        assert set(grid.query_radius(x, z, radius, kinds=(1,))) == {k for k in expected if k % 2}
+        nearest = sorted(boxes, key=lambda k: box_distance(boxes[k], x, z))[:5]
+        found = grid.nearest(x, z, 5)
+        assert [box_distance(boxes[k], x, z) for k in found] == [box_distance(boxes[k], x, z) for k in nearest]
+    assert grid.nearest(0, 0, 0) == []
+    assert SpatialGrid().nearest(0, 0) == []
+
+
+def test_save_queries_follow_moves():
+    cc2 = load()
+    elements = cc2._vehicles + cc2._tiles + list(cc2._spawns)
+    assert len(cc2.spatial) == len(elements)
+
+    tile = cc2.tiles[0]
+    box = tile_box(tile.element)
+    found = cc2.query_box(box)
+    assert tile in found
+    expected = {x.element for x in cc2.vehicles
+                if box[0] <= x.transform.tx <= box[2] and box[1] <= x.transform.tz <= box[3]}
+    assert {x.element for x in found if isinstance(x, Vehicle)} == expected
+    assert all(isinstance(x, VehicleSpawn) for x in cc2.query_box(box, kinds=(VehicleSpawn,)))
+
+    # moves are picked up
+    vehicle = cc2.vehicles[0]
+    vehicle.set_location(x=-50000, z=-50000)
+    assert cc2.nearest(-50000, -50000) == [vehicle]
+    move_vehicles([vehicle], 10, 0, 10)
+    assert cc2.query_radius(-49990, -49990, 1) == [vehicle]
+
+    tile.set_position(x=80000, z=80000)
+    assert cc2.nearest(80000, 80000, kinds=(Tile,)) == [tile]
+    spawns = tile.spawn_data.vehicles.items()
+    if spawns:
+        assert cc2.spatial.boxes[spawns[0].element] == spawn_box(spawns[0].element)
+        assert set(x.element for x in cc2.query_box(tile_box(tile.element), kinds=(VehicleSpawn,))) == \
+            {x.element for x in spawns}
+
+    # so are new and removed things
+    walrus = cc2.new_vehicle(VehicleType.Walrus)
+    assert cc2.spatial.boxes[walrus.element] == vehicle_box(walrus.element)
+    cc2.remove_vehicles([vehicle, walrus])
+    assert vehicle.element not in cc2.spatial
+    cc2.remove_tiles([tile])
+    assert cc2.query_radius(80000, 80000, 5000) == []
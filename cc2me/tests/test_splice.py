@@ -0,0 +1,59 @@
+from pathlib import Path
+import random
+
+import pytest
+
+from ..savedata.constants import VehicleType, VehicleAttachmentDefinitionIndex
+from ..savedata.loader import load_save_file, ENGINE_SINGLE_PASS, ENGINE_SPLICE, ROOT_ORDER
+from .test_load_save import assert_same_element
+
+HERE = Path(__file__).parent
+SAVE = str(HERE / "canned_saves" / "save.xml")
+
+
+def edit(cc2):
+    random.seed(1)
+    carrier = cc2.find_vehicles_by_definition(VehicleType.Carrier.int)[0]
+    carrier.set_location(x=1000, z=2000)
+
+    seal = cc2.find_vehicles_by_definition(VehicleType.Seal.int)[0]
+    data = seal.state.data
+    data.hitpoints = 12
+    seal.state.data = data
+    seal.set_attachment(1, VehicleAttachmentDefinitionIndex.MissileIRLauncher)
+
+    cc2.remove_vehicle(cc2.vehicles[-1])
+    cc2.remove_tile(cc2.tile(2))
+    island = cc2.new_tile()
+    island.set_position(x=5000, z=5000)
+    cc2.new_vehicle(VehicleType.Walrus)
+    cc2.teams[0].currency = 9999
+
+    data = cc2.weather.pressure.modify()
+    data[-1] ^= 0xFF
+
+
+def reload(text: str, filename: Path):
+    filename.write_text(text)
+    return load_save_file(str(filename))
+
+
+def test_splice_unchanged():
+    cc2 = load_save_file(SAVE, engine=ENGINE_SPLICE)
+    with open(SAVE) as fd:
+        assert cc2.export().strip() == fd.read().strip()
+
+
+@pytest.mark.parametrize("raw_spans", [False, True])
+def test_splice_export_edits(raw_spans, tmp_path):
+    full = load_save_file(SAVE, engine=ENGINE_SINGLE_PASS)
+    spliced = load_save_file(SAVE, engine=ENGINE_SPLICE, raw_spans=raw_spans)
+    edit(full)
+    edit(spliced)
+
+    expected = reload(full.export(), tmp_path / "save-full.xml")
+    saved = reload(spliced.export(), tmp_path / "save-spliced.xml")
+    for root in ROOT_ORDER:
+        assert_same_element(expected.roots[root].getroot(), saved.roots[root].getroot())
+    assert saved.weather.pressure.data[-1] == expected.weather.pressure.data[-1]
+    assert saved.find_vehicles_by_definition(VehicleType.Seal.int)[0].state.data.hitpoints == 12
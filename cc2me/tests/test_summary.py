@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import pytest
+
+from ..savedata.loader import load_save_file
+from ..savedata.summary import load_save_summary
+
+HERE = Path(__file__).parent
+
+
+def test_summary_matches_full_load():
+    filename = str(HERE / "canned_saves" / "save.xml")
+    summary = load_save_summary(filename)
+    cc2 = load_save_file(filename)
+
+    assert [x.id for x in summary.tiles] == [x.id for x in cc2.tiles]
+    assert [x.team_control for x in summary.tiles] == [x.team_control for x in cc2.tiles]
+    assert [x.id for x in summary.teams] == [x.id for x in cc2.teams]
+    assert summary.vehicle_count == len(cc2.vehicles)
+    for definition, count in summary.vehicles.items():
+        assert len(cc2.find_vehicles_by_definition(definition)) == count
+    for team, count in summary.team_vehicles.items():
+        assert len([x for x in cc2.vehicles if x.team_id == team]) == count
+    assert "4 islands" in summary.describe()
+
+
+def test_summary_not_a_save(tmp_path):
+    filename = tmp_path / "empty.xml"
+    filename.write_text("<meta/>")
+    with pytest.raises(ValueError):
+        load_save_summary(str(filename))
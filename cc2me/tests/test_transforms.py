@@ -0,0 +1,80 @@
+import math
+from pathlib import Path
+
+import numpy as np
+
+from ..savedata.constants import VehicleType
+from ..savedata.loader import load_save_file
+from ..savedata.transforms import move_vehicles, collect_transforms, read_attribs, rotate_group, transform_yaw, \
+    yaw_matrix, POSITION_ATTRIBS, MATRIX_ATTRIBS
+from ..savedata.types.utils import Location
+
+HERE = Path(__file__).parent
+
+
+def load():
+    return load_save_file(str(HERE / "canned_saves" / "save.xml"))
+
+
+def test_move_vehicles():
+    cc2 = load()
+    vehicles = cc2.vehicles[:10]
+    elements, owners = collect_transforms(vehicles)
+    assert len(elements) > len(vehicles)
+    before = read_attribs(elements, POSITION_ATTRIBS)
+
+    dx = np.arange(len(vehicles), dtype=np.float64)
+    assert move_vehicles(vehicles, dx, 0, -50) == len(elements)
+    moved = read_attribs(elements, POSITION_ATTRIBS) - before
+    assert np.allclose(moved[:, 0], dx[owners])
+    assert np.allclose(moved[:, 1], 0)
+    assert np.allclose(moved[:, 2], -50)
+    assert move_vehicles([], 1) == 0
+
+
+def test_set_location_matches_move():
+    cc2 = load()
+    vehicle = max(cc2.vehicles, key=lambda x: len(collect_transforms([x])[0]))
+    elements, _ = collect_transforms([vehicle])
+    before = read_attribs(elements, POSITION_ATTRIBS)
+    x, z = vehicle.transform.tx + 250, vehicle.transform.tz - 100
+    vehicle.set_location(x=x, z=z)
+    assert vehicle.transform.tx == x
+    assert vehicle.transform.tz == z
+    assert np.allclose(read_attribs(elements, POSITION_ATTRIBS) - before, [250, 0, -100])
+
+
+def test_rotate_group():
+    cc2 = load()
+    vehicles = cc2.vehicles[:10]
+    spawns = [x for tile in cc2.tiles for x in tile.spawn_data.vehicles.items()][:5]
+    assert spawns
+    pivot = Location(vehicles[0].transform.tx, 0, vehicles[0].transform.tz)
+    elements, _ = collect_transforms(vehicles)
+    positions = read_attribs(elements, POSITION_ATTRIBS)
+    matrices = read_attribs(elements, MATRIX_ATTRIBS)
+    spawn_x = [x.data.world_position.x for x in spawns]
+    orientations = [x.data.orientation for x in spawns]
+
+    assert rotate_group(vehicles + spawns, pivot, math.pi / 2) == len(elements) + len(spawns)
+    # a quarter turn takes +x to -z
+    turned = read_attribs(elements, POSITION_ATTRIBS)
+    assert np.allclose(turned[:, 0] - pivot.x, positions[:, 2] - pivot.z)
+    assert np.allclose(turned[:, 2] - pivot.z, pivot.x - positions[:, 0])
+    assert np.allclose(turned[:, 1], positions[:, 1])
+    for before, after in zip(matrices, read_attribs(elements, MATRIX_ATTRIBS)):
+        assert np.allclose(after.reshape((3, 3)), yaw_matrix(math.pi / 2) @ before.reshape((3, 3)))
+    for spawn, orientation in zip(spawns, orientations):
+        assert math.isclose(spawn.data.orientation, orientation + math.pi / 2)
+
+    rotate_group(vehicles + spawns, pivot, -math.pi / 2)
+    assert np.allclose(read_attribs(elements, POSITION_ATTRIBS), positions)
+    assert np.allclose(read_attribs(elements, MATRIX_ATTRIBS), matrices)
+    assert np.allclose([x.data.world_position.x for x in spawns], spawn_x)
+
+
+def test_rotate_new_vehicle():
+    cc2 = load()
+    walrus = cc2.new_vehicle(VehicleType.Walrus)
+    rotate_group([walrus], Location(walrus.transform.tx, 0, walrus.transform.tz), math.pi)
+    assert math.isclose(transform_yaw([walrus.transform.m00, 0, walrus.transform.m02]), math.pi)
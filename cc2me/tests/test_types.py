@@ -0,0 +1,149 @@
+import threading
+from pathlib import Path
+from xml.etree.ElementTree import Element
+
+import pytest
+
+from ..savedata.constants import VehicleType, VehicleAttachmentDefinitionIndex
+from ..savedata.loader import load_save_file
+from ..savedata.types.attachment_attributes import UnitAttachment
+from ..savedata.types.objects import get_unit
+from ..savedata.types.utils import Transform
+from ..savedata.types.vehicles.vehicle_state import VehicleStateContainer, VehicleAttachmentState, scan_state_root
+
+HERE = Path(__file__).parent
+
+
+def test_attribute_values_follow_the_element():
+    transform = Transform()
+    transform.tx = 1.5
+    assert transform.tx == 1.5
+    assert transform.element.attrib["tx"] == "1.5"
+    transform.element.attrib["tx"] = "2.5"
+    assert transform.tx == 2.5
+    del transform.element.attrib["tx"]
+    assert transform.tx == 0.0
+
+
+def test_attributes_are_reentrant():
+    transforms = [Transform() for _ in range(4)]
+    for i, transform in enumerate(transforms):
+        transform.tz = i
+    errors = []
+
+    def read(transform: Transform, expected: float):
+        for _ in range(2000):
+            if transform.tz != expected:
+                errors.append(transform.tz)
+
+    threads = [threading.Thread(target=read, args=(x, float(i))) for i, x in enumerate(transforms)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert Transform.tz.attribute.parent is None
+
+
+def test_proxies_have_no_dict():
+    cc2 = load_save_file(str(HERE / "canned_saves" / "save.xml"))
+    for item in [cc2.vehicles[0], cc2.vehicles[0].transform, cc2.tiles[0], cc2.teams[0], get_unit(cc2.vehicles[0])]:
+        assert not hasattr(item, "__dict__")
+
+
+def test_unit_dynamic_attachments():
+    cc2 = load_save_file(str(HERE / "canned_saves" / "save.xml"))
+    seal = get_unit(cc2.find_vehicles_by_definition(VehicleType.Seal.value)[0])
+    assert "attach1" in seal.dynamic_attachment_names
+    assert VehicleAttachmentDefinitionIndex.MissileIRLauncher in seal.attach1_choices
+    seal.attach1 = VehicleAttachmentDefinitionIndex.MissileIRLauncher
+    assert seal.attach1 == VehicleAttachmentDefinitionIndex.MissileIRLauncher
+    assert seal.vehicle().get_attachment(1) == VehicleAttachmentDefinitionIndex.MissileIRLauncher
+    with pytest.raises(AttributeError):
+        seal.attach99
+
+
+def test_embedded_state_written_at_export(tmp_path):
+    cc2 = load_save_file(str(HERE / "canned_saves" / "save.xml"))
+    unchanged = cc2.export()
+    seal = get_unit(cc2.find_vehicles_by_definition(VehicleType.Seal.value)[0])
+    state = seal.vehicle().state
+    assert state.data is state.data
+    original = state.state
+
+    seal.hitpoints = 12
+    # edited directly, found by comparing with the tree as parsed
+    state.data.internal_fuel_remaining = 3
+    assert state.state is original
+    assert seal.hitpoints == 12
+
+    seal.attach1 = VehicleAttachmentDefinitionIndex.MissileIRLauncher
+    cc2.vehicle_state(seal.vehicle().id).attachments[1].data.ammo = 7
+    saved = cc2.export()
+    assert saved != unchanged
+    assert state.state is not original
+
+    filename = tmp_path / "save.xml"
+    filename.write_text(saved)
+    reloaded = load_save_file(str(filename))
+    data = reloaded.vehicle_state(seal.vehicle().id).data
+    assert data.hitpoints == 12
+    assert data.internal_fuel_remaining == 3
+    assert reloaded.vehicle_state(seal.vehicle().id).attachments[1].data.ammo == 7
+
+
+def test_embedded_state_read_only_is_not_rewritten():
+    cc2 = load_save_file(str(HERE / "canned_saves" / "save.xml"))
+    texts = {}
+    for vehicle in cc2.vehicles:
+        texts[vehicle.id] = vehicle.state.state
+        assert vehicle.state.data.hitpoints >= 0
+    cc2.export()
+    for vehicle in cc2.vehicles:
+        assert vehicle.state.state is texts[vehicle.id]
+
+
+def test_embedded_state_without_cache():
+    state = VehicleAttachmentState(element=None, cc2obj=None)
+    data = state.data
+    data.ammo = 7
+    with pytest.raises(ValueError):
+        state.mark_dirty()
+    state.data = data
+    assert state.data.ammo == 7
+    assert 'ammo="7"' in state.state
+
+
+def test_embedded_state_peek_matches_parse():
+    cc2 = load_save_file(str(HERE / "canned_saves" / "save.xml"))
+    names = ["hitpoints", "is_destroyed", "attached_to_vehicle_id", "internal_fuel_remaining"]
+    for vehicle in cc2.vehicles:
+        state = vehicle.state
+        parsed = VehicleStateContainer(element=Element("v", dict(state.element.attrib)))
+        for name in names:
+            assert getattr(state, name) == getattr(parsed.data, name)
+
+    assert scan_state_root('<?xml version="1.0"?>\n<data a="1" b=\'x&amp;y\' c = "&quot;>"><x d="2"/></data>') == {
+        "a": "1", "b": "x&y", "c": "\">"}
+    assert scan_state_root("") == {}
+
+    # edits are seen before they are written
+    state = cc2.vehicles[0].state
+    state.data.hitpoints = 42
+    assert state.hitpoints == 42
+    assert get_unit(cc2.vehicles[0]).hitpoints == 42
+
+
+def test_units_share_attachment_slots():
+    cc2 = load_save_file(str(HERE / "canned_saves" / "save.xml"))
+    seals = [get_unit(x) for x in cc2.find_vehicles_by_definition(VehicleType.Seal.value)[:2]]
+    assert len(seals) == 2
+    assert seals[0].attachments is seals[1].attachments
+    with pytest.raises(TypeError):
+        seals[0].attachments[1] = UnitAttachment(name="extra", position=1, choices=None)
+    assert seals[0].find_attachment("attach1").position == 1
+    assert seals[0].find_attachment_choices("attach1_choices") == seals[0].attach1_choices
+    seals[0].define_attachment_point(UnitAttachment(name="extra", position=1, choices=None))
+    assert "extra1" in seals[0].dynamic_attachment_names
+    assert "attach1" not in seals[0].dynamic_attachment_names
+    assert "attach1" in seals[1].dynamic_attachment_names
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import pytest
+
+from ..savedata.constants import VehicleType, VehicleAttachmentDefinitionIndex
+from ..savedata import validation
+from ..savedata.loader import load_save_file, CC2XMLSave
+from ..savedata.validation import (validate_save, SEVERITY_ERROR, AMMO_OVER_CAPACITY, ATTACHMENT_NOT_ALLOWED,
+                                   ORPHAN_STATE, VEHICLE_ID_COUNTER)
+
+HERE = Path(__file__).parent
+
+
+def load():
+    return load_save_file(str(HERE / "canned_saves" / "save.xml"))
+
+
+def codes(diagnostics, vehicle_id=None):
+    return {x.code for x in diagnostics if vehicle_id is None or x.vehicle_id == vehicle_id}
+
+
+def test_validate_save():
+    cc2 = load()
+    found = validate_save(cc2)
+    assert not [x for x in found if x.severity == SEVERITY_ERROR]
+
+    seal = cc2.find_vehicles_by_definition(VehicleType.Seal.value)[0]
+    cc2.vehicles_parent.remove(seal.element)
+    cc2.scene_vehicles.attrib["id_counter"] = "1"
+    found = validate_save(cc2)
+    assert ORPHAN_STATE in codes(found, seal.id)
+    assert VEHICLE_ID_COUNTER in codes(found)
+
+
+def test_validate_incremental():
+    cc2 = load()
+    full = cc2.validate(incremental=False)
+    assert cc2.validator.checked == len(cc2.vehicles)
+    assert cc2.validate() == full
+    assert cc2.validator.checked == 0
+
+    walrus = cc2.find_vehicles_by_definition(VehicleType.Walrus.value)[0]
+    walrus.set_attachment(1, VehicleAttachmentDefinitionIndex.Gun120mm)
+    assert ATTACHMENT_NOT_ALLOWED in codes(cc2.validate(), walrus.id)
+    assert cc2.validator.checked == 1
+
+    walrus.set_attachment(1, VehicleAttachmentDefinitionIndex.Gun30mm)
+    assert not codes(cc2.validate(), walrus.id)
+
+    state = walrus.get_attachment_state(1)
+    state.data.ammo = 10000
+    state.mark_dirty()
+    assert codes(cc2.validate(), walrus.id) == {AMMO_OVER_CAPACITY}
+    assert cc2.validator.checked == 1
+    assert cc2.validate() == validate_save(cc2)
+
+
+def test_validate_incremental_is_cheap(monkeypatch):
+    cc2 = load()
+    cc2.validate(incremental=False)
+    seal = cc2.find_vehicles_by_definition(VehicleType.Seal.value)[0]
+    walrus = cc2.find_vehicles_by_definition(VehicleType.Walrus.value)[0]
+    id_checks = []
+    check_ids = validation.check_ids
+    monkeypatch.setattr(validation, "check_ids", lambda x: id_checks.append(x) or check_ids(x))
+
+    def walked(self):
+        pytest.fail("an incremental run walked every vehicle")
+    monkeypatch.setattr(CC2XMLSave, "vehicles", property(walked))
+
+    walrus.set_attachment(1, VehicleAttachmentDefinitionIndex.Gun120mm)
+    assert ATTACHMENT_NOT_ALLOWED in codes(cc2.validate(), walrus.id)
+    assert cc2.validator.checked == 1
+    assert not id_checks
+
+    created = cc2.new_vehicles(VehicleType.Seal, 2)
+    cc2.validate()
+    assert cc2.validator.checked == 2
+    assert len(id_checks) == 1
+    cc2.remove_vehicle(seal)
+    cc2.remove_vehicle(created[0])
+    found = cc2.validate()
+    assert cc2.validator.checked == 0
+    assert len(id_checks) == 2
+    monkeypatch.undo()
+    assert found == validate_save(cc2)
+
+    # removed directly on the tree, the container no longer matches so everything is checked again
+    cc2.vehicles_parent.remove(walrus.element)
+    cc2.validate()
+    assert cc2.validator.checked == len(cc2.vehicles)
+    assert codes(cc2.validator.diagnostics, walrus.id) == {ORPHAN_STATE}
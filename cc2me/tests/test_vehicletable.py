@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ..savedata.constants import VehicleType
+from ..savedata.loader import load_save_file
+
+HERE = Path(__file__).parent
+
+
+def load():
+    return load_save_file(str(HERE / "canned_saves" / "save.xml"))
+
+
+def test_columns_match_proxies():
+    cc2 = load()
+    table = cc2.vehicle_table()
+    assert len(table) == len(cc2.vehicles)
+    for row, vehicle in enumerate(cc2.vehicles):
+        assert table.id[row] == vehicle.id
+        assert table.definition_index[row] == vehicle.definition_index
+        assert table.team_id[row] == vehicle.team_id
+        assert table["tx"][row] == vehicle.transform.tx
+        assert table.tz[row] == vehicle.transform.tz
+        state = cc2.vehicle_state(vehicle.id)
+        if state is not None:
+            assert table.hitpoints[row] == state.data.hitpoints
+            assert table.fuel[row] == state.data.internal_fuel_remaining
+            assert table.is_destroyed[row] == state.data.is_destroyed
+
+
+def test_write_back():
+    cc2 = load()
+    table = cc2.vehicle_table()
+    carriers = table.definition_index == VehicleType.Carrier.value
+    near = table.distance_to(table.tx[carriers][0], table.tz[carriers][0]) < 5000
+    table.hitpoints[carriers] = 123
+    table.tx[near] += 100
+    assert table.write_back() == np.count_nonzero(carriers | near)
+    assert table.write_back() == 0
+
+    for vehicle in table.select(carriers):
+        assert vehicle.state.hitpoints == 123
+    again = cc2.vehicle_table()
+    assert np.array_equal(again.tx, table.tx)
+    assert np.array_equal(again.hitpoints, table.hitpoints)
+
+    seals = table.definition_index == VehicleType.Seal.value
+    table.team_id[seals] = 7
+    assert table.write_back() == np.count_nonzero(seals)
+    assert {x.element for x in cc2.find_vehicles_by_team(7)} == {x.element for x in table.select(seals)}
+    cc2.export()
+    for vehicle in table.select(carriers):
+        assert 'hitpoints="123"' in cc2.vehicle_state(vehicle.id).state
+
+    table.id[0] = 9999
+    with pytest.raises(ValueError):
+        table.write_back()
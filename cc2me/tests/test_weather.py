@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ..savedata.loader import load_save_file, ENGINE_MMAP
+from ..savedata.rawspans import find_weather_spans
+from ..savedata.types.weather import WeatherGrid, PressureGrid, decode_grid_hex, encode_grid_hex
+
+HERE = Path(__file__).parent
+SAVE = str(HERE / "canned_saves" / "save.xml")
+
+
+def test_grid_hex_round_trip():
+    text = "00008000871041C9"
+    values = decode_grid_hex(text)
+    # written low nibble first
+    assert values[2] == 0x08
+    assert encode_grid_hex(values) == text
+
+
+def test_read_weather():
+    cc2 = load_save_file(SAVE)
+    weather = cc2.weather
+    assert weather.rng_state == 1441984990
+    assert weather.velocity.size_x == 256
+    assert weather.velocity.channels == 2
+    assert weather.pressure.channels == 1
+    assert weather.properties.channels == 3
+    assert weather.pressure.is_packed
+    with pytest.raises(ValueError):
+        assert weather.pressure.grid is None
+
+
+@pytest.mark.parametrize("raw_spans", [False, True])
+def test_modify_weather(raw_spans, tmp_path):
+    cc2 = load_save_file(SAVE, engine=ENGINE_MMAP, raw_spans=raw_spans)
+    unchanged = cc2.export()
+    assert not cc2.weather.pressure.modified
+    assert cc2.export() == unchanged
+
+    data = cc2.weather.pressure.modify()
+    data[-1] ^= 0xFF
+    saved = cc2.export()
+    assert saved != unchanged
+    assert not cc2.weather.pressure.modified
+
+    filename = tmp_path / "weather.xml"
+    filename.write_text(saved)
+    reloaded = load_save_file(str(filename))
+    assert np.array_equal(reloaded.weather.pressure.data, data)
+    assert np.array_equal(reloaded.weather.velocity.data, cc2.weather.velocity.data)
+
+
+def test_unpacked_grid():
+    grid = PressureGrid()
+    grid.size_x = 4
+    grid.size_y = 2
+    grid.grid = np.full((2, 4, 1), 1.5)
+    grid.flush()
+
+    copy = WeatherGrid(element=grid.element)
+    assert not copy.is_packed
+    assert copy.unpacked_size == 32
+    assert copy.grid.shape == (2, 4, 1)
+    assert copy.grid[1, 3, 0] == 1.5
+
+
+def test_find_weather_spans():
+    data = (b'<weather a="1">\n<velocity_map data="x"/>\n<velocity data="AA"/>\n</weather>\n'
+            b'<weather_log data="y"/>\n'
+            b'<weather a="2">\n<pressure size_x="1" data="BB"/>\n<velocity data="CC"/>\n</weather>\n'
+            b'<pressure data="DD"/>\n')
+    spans = find_weather_spans(data)
+    assert [data[start:end] for start, end in spans] == [b"AA", b"BB", b"CC"]
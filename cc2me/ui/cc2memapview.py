@@ -50,7 +50,7 @@ class CC2MeMapView(TkinterMapView):
             pass
 
     def set_zoom(self, zoom: int, relative_pointer_x: float = 0.5, relative_pointer_y: float = 0.5):
-        logger.info(f"zoom {zoom}")
+        logger.debug("zoom %s", zoom)
         super().set_zoom(zoom, relative_pointer_x, relative_pointer_y)
 
     def set_mouse_arrow(self):
@@ -1,10 +1,15 @@
 """Dialog to select a CC2 save slot"""
+import os
 import tkinter
 from functools import partial
+from typing import Optional
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
+from xml.parsers import expat
 from tkinter import simpledialog
 
+from ..savedata.summary import load_save_summary
+
 
 class SlotChooser(simpledialog.Dialog):
 
@@ -17,12 +22,16 @@ class SlotChooser(simpledialog.Dialog):
         super().body(master)
         for slot in self.slots:
             callback = partial(self.select, dict(slot))
+            text = slot["display"]
+            if slot.get("summary"):
+                text = f"{text} ({slot['summary'].describe()})"
             btn = tkinter.Button(master,
-                                 text=slot["display"],
+                                 text=text,
                                  command=callback)
             btn.pack(fill=tkinter.X)
 
-    def __init__(self, app, persistent_file: str, choice: dict, title="Load a save slot",  ):
+    def __init__(self, app, persistent_file: str, choice: dict, title="Load a save slot",
+                 saves_dir: Optional[str] = None):
         self.persistent_file = persistent_file
         self.slots = []
         self.choice = choice
@@ -36,9 +45,19 @@ class SlotChooser(simpledialog.Dialog):
                 if filename:
                     self.slots.append({
                         "filename": filename,
-                        "display": text
+                        "display": text,
+                        "summary": self.read_summary(saves_dir, filename),
                     })
 
         super(SlotChooser, self).__init__(parent=app, title=title)
 
+    @staticmethod
+    def read_summary(saves_dir: Optional[str], filename: str):
+        if saves_dir:
+            try:
+                return load_save_summary(os.path.join(saves_dir, filename, "save.xml"))
+            except (OSError, ValueError, expat.ExpatError):
+                pass
+        return None
+
 
@@ -9,9 +9,13 @@ from typing import Optional, List
 
 from .properties import Properties
 from ..savedata.constants import get_island_name, VehicleType, VehicleAttachmentDefinitionIndex
-from ..savedata.types.objects import Island, Unit, get_unit, Spawn
+from ..savedata.types.objects import Island, Unit, get_unit, Spawn, LOC_SCALE_FACTOR
+from ..savedata.types.spawndata import VehicleSpawn
 from ..savedata.types.tiles import Tile
+from ..savedata.types.vehicles.vehicle import Vehicle
 from ..savedata.loader import CC2XMLSave, load_save_file
+from ..savedata.logging import enable_logging
+from ..savedata.transforms import move_vehicles
 from .cc2memapview import CC2MeMapView
 from .toolbar import Toolbar
 from .saveslotchooser import SlotChooser
@@ -163,10 +167,13 @@ class App(tkinter.Tk):
         selected = []
         self.select_none()
         if mode == "units":
+            # map positions are (z, x) / LOC_SCALE_FACTOR
+            box = (nw[1] * LOC_SCALE_FACTOR, se[0] * LOC_SCALE_FACTOR,
+                   se[1] * LOC_SCALE_FACTOR, nw[0] * LOC_SCALE_FACTOR)
+            found = {x.element for x in self.cc2me.query_box(box, kinds=(Vehicle, VehicleSpawn))}
             for u in self.units + self.spawns:
-                if se[0] < u.position[0] < nw[0]:
-                    if se[1] > u.position[1] > nw[1]:
-                        selected.append(u)
+                if u.unit.object.element in found:
+                    selected.append(u)
         self.select_markers(selected)
 
     def select_markers(self, markers):
@@ -266,14 +273,21 @@ class App(tkinter.Tk):
 
     def remove_item(self):
         selected = self.selected_markers()
+        tiles = []
+        vehicles = []
+        respawn_ids = []
         for marker in selected:
             if isinstance(marker, IslandMarker):
-                tile = marker.island.tile()
-                self.cc2me.remove_tile(tile)
+                tiles.append(marker.island.tile())
             if isinstance(marker, UnitMarker):
-                vehicle = marker.unit.vehicle()
-                self.cc2me.remove_vehicle(vehicle)
+                if isinstance(marker.unit, Spawn):
+                    respawn_ids.append(marker.unit.spawn().data.respawn_id)
+                else:
+                    vehicles.append(marker.unit.vehicle())
             marker.delete()
+        self.cc2me.remove_tiles(tiles)
+        self.cc2me.remove_vehicles(vehicles)
+        self.cc2me.remove_spawns(respawn_ids)
         self.select_none()
 
     def start(self):
@@ -286,7 +300,13 @@ class App(tkinter.Tk):
     def save(self, filename):
         print(f"Saving {filename}")
         with open(filename, "w") as fd:
-            fd.write(self.cc2me.export())
+            report = self.cc2me.export_to(fd, progress=self.show_progress)
+        self.status_line.set(f"Saved {filename} ({report.seconds:.2f}s)")
+
+    def show_progress(self, phase: str, done: int, total: int):
+        if total:
+            self.status_line.set(f"{phase} {100 * done // total}% ..")
+            self.status_bar.update_idletasks()
 
     def save_as(self):
         filename = filedialog.asksaveasfilename(title="Save CC2 map as..")
@@ -326,14 +346,16 @@ class App(tkinter.Tk):
 
     def open_slot(self):
         choice = {}
-        SlotChooser(self, persistent_file=self.persistent, choice=choice)
+        SlotChooser(self, persistent_file=self.persistent, choice=choice,
+                    saves_dir=os.path.join(self.cc2dir, "saved_games"))
         if choice:
             filename = os.path.join(self.cc2dir, "saved_games", choice[1]["filename"], "save.xml")
             self.read_file(filename)
 
     def save_slot(self):
         choice = {}
-        SlotChooser(self, persistent_file=self.persistent, choice=choice, title="Overwrite CC2 Save Slot")
+        SlotChooser(self, persistent_file=self.persistent, choice=choice, title="Overwrite CC2 Save Slot",
+                    saves_dir=os.path.join(self.cc2dir, "saved_games"))
         if choice:
             filename = os.path.join(self.cc2dir, "saved_games", choice[1]["filename"], "save.xml")
             self.save_filename = filename
@@ -347,7 +369,7 @@ class App(tkinter.Tk):
     def read_file(self, filename):
         self.clear()
         if filename and os.path.exists(filename):
-            self.cc2me = load_save_file(filename)
+            self.cc2me = load_save_file(filename, cache=True, progress=self.show_progress)
             self.save_filename = filename
         self.islands.clear()
         self.map_widget.update()
@@ -445,11 +467,17 @@ class App(tkinter.Tk):
                 dlat = lat - olat
                 dlon = lon - olon
 
-                selected = self.selected_markers()
-                for marker in selected:
-                    m_lat, m_lon = marker.position
-                    marker.move(m_lat + dlat,
-                                m_lon + dlon)
+                # units are moved together, keeping their altitude
+                vehicles = []
+                for marker in self.selected_markers():
+                    vehicle = marker.object.vehicle() if isinstance(marker.object, Unit) else None
+                    if vehicle is not None:
+                        vehicles.append(vehicle)
+                    else:
+                        m_lat, m_lon = marker.position
+                        marker.move(m_lat + dlat,
+                                    m_lon + dlon)
+                move_vehicles(vehicles, dlon * LOC_SCALE_FACTOR, 0, dlat * LOC_SCALE_FACTOR)
 
             for marker in self.selected_markers():
                 marker.draw()
@@ -464,6 +492,7 @@ class App(tkinter.Tk):
 
 def run(args=None):
     parser.parse_args(args)
+    enable_logging()
     app = App()
     app.start()
 
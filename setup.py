@@ -4,6 +4,7 @@ VERSION = "0.0.5"
 requirements = [
     "tkintermapview==1.15",
     "pillow==9.2.0",
+    "numpy",
 ]
 
 setup(